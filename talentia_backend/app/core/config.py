@@ -1,4 +1,6 @@
 import os
+from typing import List
+
 from pydantic import BaseSettings
 
 
@@ -8,6 +10,84 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    # inference backend: "torch", "torch-int8", "onnx" or "onnx-int8" (see app/nlp/backends.py)
+    EMBEDDING_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = os.path.join(os.path.dirname(__file__), "..", "..", "data", "onnx")
+    # how embeddings are written to MongoDB: "float32" / "float16" packed Binary, or legacy "list"
+    EMBEDDING_STORAGE_DTYPE: str = "float32"
+    # load and warm the embedding model at startup instead of on the first request
+    PRELOAD_MODEL: bool = True
+    # texts per model.encode call, and how long the async batcher waits to fill a batch
+    EMBED_BATCH_SIZE: int = 32
+    EMBED_BATCH_WAIT_MS: int = 5
+    # executor sizes for model inference (threads) and PDF/OCR parsing (processes); 0 = from core count
+    MODEL_POOL_THREADS: int = 0
+    PARSE_POOL_PROCESSES: int = 0
+    # server worker processes sharing the cores (exported by gunicorn_conf.py); splits the parse pool default
+    WEB_CONCURRENCY: int = 1
+    # embedding cache: in-memory LRU entries, plus an optional SQLite tier ("" disables it)
+    EMBEDDING_CACHE_SIZE: int = 20000
+    EMBEDDING_CACHE_PATH: str = os.path.join(os.path.dirname(__file__), "..", "..", "data", "embedding_cache.sqlite3")
+    EMBEDDING_CACHE_DISK_MAX: int = 500000
+    # seconds between catch-up reads of documents inserted by other processes
+    INDEX_REFRESH_SECONDS: int = 30
+    # job matching backend: "exact" (in-memory matrix) or "ann" (FAISS IVF built by rebuild_ann_index.py)
+    MATCH_BACKEND: str = "exact"
+    ANN_INDEX_PATH: str = os.path.join(os.path.dirname(__file__), "..", "..", "data", "jobs_ivf.index")
+    ANN_NLIST: int = 1024
+    ANN_NPROBE: int = 16
+    # per-candidate cached match results: candidates kept, and top-k stored per candidate
+    MATCH_CACHE_SIZE: int = 5000
+    MATCH_CACHE_K: int = 50
+    # batch matching: candidates scored per block, and job rows per block of the matrix product
+    MATCH_BATCH_BLOCK: int = 64
+    MATCH_BATCH_JOB_BLOCK: int = 50000
+    # precomputed matches (materialize_matches.py): k stored per candidate, and hours they stay fresh
+    MATERIALIZED_MATCHES_K: int = 20
+    MATERIALIZED_MATCHES_MAX_AGE_HOURS: int = 26
+    # hybrid job search: vector hits fused with BM25 hits, and the reciprocal rank fusion constant
+    SEARCH_VECTOR_CANDIDATES: int = 200
+    SEARCH_RRF_K: int = 60
+    # /jobs/all: how long an exact total stays cached per filter set
+    JOB_COUNT_CACHE_SECONDS: int = 60
+    # cached /jobs/all and /jobs/search responses: "memory" (per process) or "redis" (shared)
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_SIZE: int = 2000
+    # in-memory LRU of free-text search query embeddings
+    QUERY_EMBEDDING_CACHE_SIZE: int = 2000
+
+    # jobs per unordered bulk upsert when ingesting scraped jobs
+    INGEST_BATCH_SIZE: int = 500
+    # streaming ingest: jobs held by each queue between stages, and jobs per embedding call
+    INGEST_QUEUE_SIZE: int = 256
+    INGEST_EMBED_BATCH: int = 64
+
+    # JSearch API root; overridable so tests and benchmarks can point at scrapers/jsearch_standin.py
+    JSEARCH_BASE_URL: str = "https://jsearch.p.rapidapi.com"
+    # concurrent JSearch requests per async scrape run
+    JSEARCH_CONCURRENCY: int = 5
+
+    # scrape scheduler: periodic run of SCRAPE_QUERIES, and per-query minimum refresh interval
+    SCRAPE_SCHEDULER_ENABLED: bool = True
+    SCRAPE_INTERVAL_MINUTES: int = 60
+    SCRAPE_MIN_REFRESH_MINUTES: int = 30
+    SCRAPE_LEASE_MINUTES: int = 15
+    SCRAPE_LOCATION: str = "Morocco"
+    SCRAPE_LIMIT: int = 20
+    SCRAPE_QUERIES: List[str] = [
+        "data scientist",
+        "software engineer",
+        "backend developer",
+        "frontend developer",
+        "full stack developer",
+        "machine learning engineer",
+        "devops engineer",
+        "product manager",
+        "qa tester",
+        "business analyst",
+    ]
 
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), "..", ".env")
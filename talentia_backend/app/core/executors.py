@@ -0,0 +1,72 @@
+"""Executors for CPU-bound work that must not run on the event loop.
+
+Model inference goes to a thread pool (PyTorch / ONNX release the GIL while they
+compute); PDF parsing and OCR go to a process pool since pdfminer is pure Python.
+Both pools are created on first use and sized from the available cores unless
+MODEL_POOL_THREADS / PARSE_POOL_PROCESSES are set. Every server worker has its
+own parse pool, so by default the cores are split across WEB_CONCURRENCY workers.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_model_pool: Optional[ThreadPoolExecutor] = None
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_model_pool() -> ThreadPoolExecutor:
+    global _model_pool
+    if _model_pool is None:
+        # the model parallelizes each batch internally, so a few threads are enough
+        workers = settings.MODEL_POOL_THREADS or max(1, min(4, available_cores() // 2))
+        _model_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='model')
+        logger.info(f"Model thread pool started with {workers} threads")
+    return _model_pool
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        # one pool per server worker: share the cores instead of each worker taking them all
+        workers = settings.PARSE_POOL_PROCESSES or max(1, available_cores() // max(1, settings.WEB_CONCURRENCY))
+        # spawn, not fork: the parent holds event-loop, Mongo and model threads
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"Parse process pool started with {workers} processes")
+    return _parse_pool
+
+
+async def run_in_model_pool(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_model_pool(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_in_parse_pool(fn: Callable, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executors():
+    global _model_pool, _parse_pool
+    if _model_pool is not None:
+        _model_pool.shutdown(wait=False, cancel_futures=True)
+        _model_pool = None
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
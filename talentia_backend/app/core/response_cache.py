@@ -0,0 +1,174 @@
+"""TTL response cache for read-heavy endpoints, keyed by normalized query parameters.
+
+Two backends:
+
+- ``memory``: a per-process TTL + LRU cache (`TTLCache`).
+- ``redis``: shared by every worker. Entries expire through Redis TTLs, and
+  invalidation bumps a generation number that is part of every key, so all
+  workers stop seeing old entries at once without scanning keys.
+
+Use `cached_response(cache)` on a route and call `cache.invalidate()` whenever
+the underlying data changes.
+"""
+import functools
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    name = 'memory'
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    async def clear(self, namespace: str):
+        self._cache.clear()
+
+    async def generation(self, namespace: str) -> int:
+        return 0
+
+    def size(self) -> Optional[int]:
+        return len(self._cache)
+
+
+class RedisCacheBackend:
+    """Entries stored as JSON strings under ``<namespace>:<generation>:<key>``."""
+    name = 'redis'
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as aioredis
+        except Exception as e:
+            raise RuntimeError("redis not available. Install redis or use RESPONSE_CACHE_BACKEND=memory: " + str(e))
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._redis.set(key, json.dumps(value), ex=max(1, int(ttl)))
+
+    async def clear(self, namespace: str):
+        # old generations simply expire
+        await self._redis.incr(f'{namespace}:generation')
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self._redis.get(f'{namespace}:generation') or 0)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def make_backend():
+    if settings.RESPONSE_CACHE_BACKEND == 'redis':
+        try:
+            return RedisCacheBackend(settings.REDIS_URL)
+        except RuntimeError as e:
+            logger.warning(f"Shared response cache unavailable, using in-process cache: {e}")
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+class ResponseCache:
+    def __init__(self, namespace: str, backend, ttl: float):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @staticmethod
+    def normalize(params: dict) -> str:
+        """Canonical form of query parameters: unset values dropped, strings trimmed, keys sorted."""
+        canonical = {}
+        for name, value in params.items():
+            if isinstance(value, str):
+                value = ' '.join(value.split())
+            if value is None or value == '':
+                continue
+            canonical[name] = value
+        return json.dumps(canonical, sort_keys=True, default=str)
+
+    async def _key(self, endpoint: str, params: dict) -> str:
+        digest = hashlib.sha1(f'{endpoint}?{self.normalize(params)}'.encode()).hexdigest()
+        generation = await self.backend.generation(self.namespace)
+        return f'{self.namespace}:{generation}:{digest}'
+
+    async def get(self, endpoint: str, params: dict) -> Optional[Any]:
+        try:
+            value = await self.backend.get(await self._key(endpoint, params))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, endpoint: str, params: dict, value: Any):
+        try:
+            await self.backend.set(await self._key(endpoint, params), value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def invalidate(self):
+        self.invalidations += 1
+        try:
+            await self.backend.clear(self.namespace)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'ttl_seconds': self.ttl,
+            'size': self.backend.size(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'errors': self.errors,
+        }
+
+
+def cached_response(cache: ResponseCache):
+    """Cache a route's JSON-encoded result, keyed by its name and keyword arguments.
+
+    Only for routes whose arguments are all query parameters.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**params):
+            cached = await cache.get(func.__name__, params)
+            if cached is not None:
+                return cached
+            result = jsonable_encoder(await func(**params))
+            await cache.set(func.__name__, params, result)
+            return result
+        return wrapper
+    return decorator
+
+
+job_response_cache = ResponseCache('jobs', make_backend(), settings.RESPONSE_CACHE_TTL_SECONDS)
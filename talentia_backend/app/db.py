@@ -6,3 +6,17 @@ db = client.get_default_database()
 
 def get_collection(name: str):
     return db[name]
+
+
+async def ensure_indexes():
+    """Create the MongoDB indexes the API relies on (no-op when they exist)."""
+    jobs = db['jobs']
+    # keyset pagination of /jobs/all, newest first
+    await jobs.create_index([('scraped_at', -1), ('_id', -1)])
+    # ingest dedup keys (see app.ingest); partial so documents without them are not indexed
+    await jobs.create_index(
+        'url_hash', unique=True, partialFilterExpression={'url_hash': {'$type': 'string'}}
+    )
+    await jobs.create_index(
+        'fingerprint', unique=True, partialFilterExpression={'fingerprint': {'$type': 'string'}}
+    )
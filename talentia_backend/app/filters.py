@@ -0,0 +1,67 @@
+"""Job listing filters shared by the MongoDB queries and the in-memory job index."""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+# attribute columns the job vector index keeps per row (see app.nlp.attribute_columns)
+JOB_ATTRIBUTES = {
+    'location': 'category', 'type': 'category', 'source': 'category',
+    'scraped_at': 'time', 'posted_date': 'time',
+}
+
+
+def _regex_predicate(pattern: str) -> Callable[[str], bool]:
+    # same semantics as the {'$regex': ..., '$options': 'i'} Mongo filters
+    try:
+        compiled = re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        compiled = re.compile(re.escape(pattern), re.IGNORECASE)
+    return lambda value: compiled.search(value) is not None
+
+
+@dataclass
+class JobFilters:
+    location: Optional[str] = None
+    contract: Optional[str] = None
+    source: Optional[str] = None
+    days: Optional[int] = None
+    posted_days: Optional[int] = None
+
+    def __bool__(self):
+        return bool(self.location or self.contract or self.source or self.days or self.posted_days)
+
+    def cutoff(self, days: Optional[int] = None) -> datetime:
+        return datetime.utcnow() - timedelta(days=days or self.days)
+
+    def mongo_query(self) -> dict:
+        query = {}
+        if self.location:
+            query['location'] = {'$regex': self.location, '$options': 'i'}
+        if self.contract:
+            query['type'] = {'$regex': self.contract, '$options': 'i'}
+        if self.source:
+            query['source'] = self.source
+        if self.days:
+            query['scraped_at'] = {'$gte': self.cutoff()}
+        if self.posted_days:
+            query['posted_date'] = {'$gte': self.cutoff(self.posted_days)}
+        return query
+
+    def index_conditions(self) -> Dict[str, Callable]:
+        """The same filters as predicates for `VectorIndex.mask` over JOB_ATTRIBUTES."""
+        conditions = {}
+        if self.location:
+            conditions['location'] = _regex_predicate(self.location)
+        if self.contract:
+            conditions['type'] = _regex_predicate(self.contract)
+        if self.source:
+            source = self.source
+            conditions['source'] = lambda value: value == source
+        if self.days:
+            since = self.cutoff().replace(tzinfo=timezone.utc).timestamp()
+            conditions['scraped_at'] = lambda timestamps: timestamps >= since
+        if self.posted_days:
+            posted_since = self.cutoff(self.posted_days).replace(tzinfo=timezone.utc).timestamp()
+            conditions['posted_date'] = lambda timestamps: timestamps >= posted_since
+        return conditions
@@ -0,0 +1,114 @@
+"""Process-local search indexes and the hooks that keep them in sync with MongoDB.
+
+Every code path that inserts or deletes jobs should call the matching hook so the
+in-memory indexes stay consistent without reloading the whole collection.
+"""
+import logging
+from typing import Iterable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.response_cache import job_response_cache
+from app.db import get_collection
+from app.filters import JOB_ATTRIBUTES
+from app.nlp.ann_index import AnnIndex
+from app.nlp.autocomplete import PrefixIndex
+from app.nlp.bm25 import BM25Index
+from app.nlp.facet_index import FacetIndex
+from app.nlp.match_cache import match_cache
+from app.nlp.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+job_index = VectorIndex('jobs', attributes=JOB_ATTRIBUTES)
+candidate_index = VectorIndex('candidates')
+ann_index = AnnIndex(settings.ANN_INDEX_PATH, settings.ANN_NPROBE)
+keyword_index = BM25Index('jobs')
+facet_index = FacetIndex('jobs', JOB_ATTRIBUTES)
+prefix_index = PrefixIndex('jobs')
+# /jobs/all totals per filter set; any ingest or delete makes them stale
+job_count_cache = TTLCache(1024, settings.JOB_COUNT_CACHE_SECONDS)
+
+_ann_unavailable_logged = False
+
+
+async def get_job_index() -> VectorIndex:
+    await job_index.ensure_loaded()
+    return job_index
+
+
+async def get_keyword_index() -> BM25Index:
+    await keyword_index.ensure_loaded()
+    return keyword_index
+
+
+async def get_facet_index() -> FacetIndex:
+    await facet_index.ensure_loaded()
+    return facet_index
+
+
+async def get_prefix_index() -> PrefixIndex:
+    await prefix_index.ensure_loaded()
+    return prefix_index
+
+
+async def get_candidate_index() -> VectorIndex:
+    await candidate_index.ensure_loaded()
+    return candidate_index
+
+
+async def get_match_index():
+    """Return the index selected by MATCH_BACKEND, falling back to the exact scan."""
+    global _ann_unavailable_logged
+    if settings.MATCH_BACKEND == 'ann':
+        try:
+            if not ann_index.available():
+                raise RuntimeError(f"no ANN index at {ann_index.path}; run rebuild_ann_index.py")
+            await ann_index.ensure_loaded()
+            return ann_index
+        except RuntimeError as e:
+            if not _ann_unavailable_logged:
+                logger.warning(f"ANN backend unavailable, using exact search: {e}")
+                _ann_unavailable_logged = True
+    return await get_job_index()
+
+
+async def on_jobs_inserted(docs: Iterable[dict]):
+    """Register newly inserted job documents (must already carry their `_id`).
+
+    Indexes that have not been loaded yet are skipped: they read the documents from
+    MongoDB when first used.
+    """
+    docs = list(docs)
+    job_count_cache.clear()
+    await job_response_cache.invalidate()
+    for index in (job_index, ann_index, keyword_index, facet_index, prefix_index):
+        if index.loaded:
+            index.add_documents(docs)
+
+
+async def on_jobs_deleted(ids: Iterable):
+    ids = list(ids)
+    job_count_cache.clear()
+    await job_response_cache.invalidate()
+    for index in (job_index, ann_index, keyword_index, facet_index, prefix_index):
+        if index.loaded:
+            index.remove(ids)
+
+
+async def on_candidates_changed(docs: Iterable[dict]):
+    """Register inserted or re-embedded candidate documents (with `_id` and `embedding`)."""
+    docs = list(docs)
+    match_cache.invalidate(doc['_id'] for doc in docs)
+    # precomputed matches were scored against the old embedding
+    await get_collection('matches').delete_many({'_id': {'$in': [doc['_id'] for doc in docs]}})
+    if candidate_index.loaded:
+        candidate_index.add_documents(docs)
+
+
+async def on_candidates_deleted(ids: Iterable):
+    ids = list(ids)
+    match_cache.invalidate(ids)
+    await get_collection('matches').delete_many({'_id': {'$in': ids}})
+    if candidate_index.loaded:
+        candidate_index.remove(ids)
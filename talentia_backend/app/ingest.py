@@ -0,0 +1,265 @@
+"""Idempotent job ingest shared by every scraper path.
+
+Each job gets two dedup keys: `url_hash`, a hash of its normalized URL, and
+`fingerprint`, a hash of its normalized title and company. Both have partial
+unique indexes (see `app.db.ensure_indexes`). Jobs are written in batches of
+unordered upserts keyed on `url_hash`, or on `fingerprint` when there is no URL.
+A re-scraped posting therefore updates its document in place. A posting that
+reappears under a different URL hits the fingerprint index and is skipped.
+
+`content_hash` records the text the embedding was computed from. Before
+embedding, `select_for_embedding` looks up a scraped batch in one query, so only
+new or changed postings reach the model.
+"""
+import hashlib
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db import get_collection
+from app.indexes import on_jobs_inserted
+from app.nlp.autocomplete import normalize_phrase
+from app.nlp.embedding_cache import normalize_text
+from app.nlp.vector_codec import encode_embedding
+from scrapers.job_scraper import extract_skills_from_text
+
+logger = logging.getLogger(__name__)
+
+# query parameters dropped from URLs: exact names, plus any `utm_*` parameter
+# (a prefix match would also drop identifying ones such as `refNum` or `reference`)
+_TRACKING_PARAMS = frozenset(('trk', 'ref', 'refid', 'trackingid', 'fbclid', 'gclid'))
+_TRACKING_PREFIX = 'utm_'
+_DUPLICATE_KEY = 11000
+# kept from the first scrape, so keyset pagination and "new in N days" filters stay stable.
+# Scrapers fall back to the scrape time when a posting has no date, so a re-scrape
+# must not count a new `posted_date` as a change either.
+_FIRST_SEEN_FIELDS = ('scraped_at', 'posted_date')
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme and host; drop fragments, tracking parameters and trailing slashes."""
+    parts = urlsplit((url or '').strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIX)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), urlencode(query), ''))
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+
+
+def fingerprint(title: str, company: str) -> str:
+    return hashlib.sha1(f"{normalize_phrase(title)}\0{normalize_phrase(company)}".encode('utf-8')).hexdigest()
+
+
+def job_keys(job: dict) -> dict:
+    """Dedup keys of a job; `url_hash` is omitted when the job has no URL."""
+    keys = {'fingerprint': fingerprint(job.get('title'), job.get('company'))}
+    if job.get('url'):
+        keys['url_hash'] = url_hash(job['url'])
+    return keys
+
+
+def add_skills(job: dict):
+    """Extract `skills` from the title and description when the scraper gave none.
+
+    Stored with the job so readers (autocomplete) never scan descriptions.
+    """
+    if not job.get('skills'):
+        job['skills'] = extract_skills_from_text(f"{job.get('title') or ''} {job.get('description') or ''}")
+
+
+def content_hash(job: dict) -> str:
+    """Hash of the embedded text (title, company and description)."""
+    text = f"{job.get('title') or ''}\n{job.get('company') or ''}\n{job.get('description') or ''}"
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+async def select_for_embedding(jobs: List[dict]) -> List[dict]:
+    """Pre-embed stage: return the jobs that need a new embedding.
+
+    A job is skipped when a stored job with the same key has the same
+    `content_hash`, or when its URL is new but its fingerprint is already stored
+    (ingest would reject it). Skipped jobs lose their `embedding` field, so ingest
+    leaves the stored vector in place. All jobs are returned if the lookup fails.
+    """
+    if not jobs:
+        return []
+    for job in jobs:
+        job.update(job_keys(job))
+        job['content_hash'] = content_hash(job)
+    query = {'$or': [
+        {'url_hash': {'$in': [j['url_hash'] for j in jobs if 'url_hash' in j]}},
+        {'fingerprint': {'$in': [j['fingerprint'] for j in jobs]}},
+    ]}
+    projection = {'_id': 0, 'url_hash': 1, 'fingerprint': 1, 'content_hash': 1}
+    try:
+        stored = await get_collection('jobs').find(query, projection).to_list(None)
+    except Exception as e:
+        logger.warning(f"Pre-embed lookup failed, embedding all {len(jobs)} jobs: {e}")
+        return jobs
+    by_url = {doc['url_hash']: doc.get('content_hash') for doc in stored if doc.get('url_hash')}
+    by_fingerprint = {doc['fingerprint']: doc.get('content_hash') for doc in stored if doc.get('fingerprint')}
+
+    selected = []
+    for job in jobs:
+        if 'url_hash' in job and job['url_hash'] in by_url:
+            changed = by_url[job['url_hash']] != job['content_hash']
+        elif job['fingerprint'] in by_fingerprint:
+            changed = 'url_hash' not in job and by_fingerprint[job['fingerprint']] != job['content_hash']
+        else:
+            changed = True
+        if changed:
+            selected.append(job)
+        else:
+            job.pop('embedding', None)
+    logger.info(f"Pre-embed lookup: {len(selected)} of {len(jobs)} jobs new or changed")
+    return selected
+
+
+@dataclass
+class IngestResult:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    def __iadd__(self, other: 'IngestResult'):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        return self
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+async def ingest_jobs(jobs: Iterable[dict], batch_size: Optional[int] = None) -> IngestResult:
+    """Upsert scraped jobs and register new or changed ones with the in-memory indexes.
+
+    `skipped` counts jobs without a title, duplicates within the input, jobs that
+    match an existing document unchanged, and jobs rejected by the fingerprint index.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    result = IngestResult()
+    # last occurrence wins for duplicates within the input
+    unique = {}
+    for job in jobs:
+        if not job.get('title'):
+            result.skipped += 1
+            continue
+        job = {k: v for k, v in job.items() if k != '_id'}
+        job.update(job_keys(job))
+        add_skills(job)
+        job['content_hash'] = content_hash(job)
+        if 'embedding' in job:
+            job['embedding'] = encode_embedding(job['embedding'])
+            if job['embedding'] is None:
+                # not embedded: keep any stored vector, and embed again on the next scrape
+                del job['content_hash']
+        key = ('url_hash', job['url_hash']) if 'url_hash' in job else ('fingerprint', job['fingerprint'])
+        if key in unique:
+            result.skipped += 1
+        unique[key] = job
+
+    items = list(unique.items())
+    for start in range(0, len(items), batch_size):
+        result += await _upsert_batch(items[start:start + batch_size])
+    logger.info(f"Ingested jobs: {result.inserted} inserted, {result.updated} updated, {result.skipped} skipped")
+    return result
+
+
+def _same(stored, value) -> bool:
+    if isinstance(stored, datetime) and isinstance(value, datetime):
+        # BSON dates keep milliseconds only
+        return abs(stored - value) < timedelta(milliseconds=1)
+    return stored == value
+
+
+async def _upsert_batch(items: List[tuple]) -> IngestResult:
+    """Insert new jobs and `$set` the changed fields of stored ones.
+
+    Stored documents are read first, so unchanged jobs cost no write and only
+    documents that really changed are re-indexed (merged with their stored
+    fields, including an embedding the job itself does not carry).
+    """
+    col = get_collection('jobs')
+    stored = await _stored_documents(col, [key for key, _ in items])
+    ops, op_docs, upsert_ops = [], [], set()
+    skipped = 0
+    for (field, value), job in items:
+        doc = stored.get((field, value))
+        if doc is None:
+            insert_only = [k for k in _FIRST_SEEN_FIELDS if k in job]
+            if 'embedding' in job and job['embedding'] is None:
+                insert_only.append('embedding')
+            update = {'$set': {k: v for k, v in job.items() if k not in insert_only}}
+            if insert_only:
+                update['$setOnInsert'] = {k: job[k] for k in insert_only}
+            upsert_ops.add(len(ops))
+            ops.append(UpdateOne({field: value}, update, upsert=True))
+            op_docs.append(job)
+            continue
+        changes = {
+            k: v for k, v in job.items()
+            if k not in _FIRST_SEEN_FIELDS and not (k == 'embedding' and v is None) and not _same(doc.get(k), v)
+        }
+        if not changes:
+            skipped += 1
+            continue
+        ops.append(UpdateOne({'_id': doc['_id']}, {'$set': changes}))
+        op_docs.append({**doc, **changes})
+    if not ops:
+        return IngestResult(skipped=skipped)
+
+    try:
+        res = (await col.bulk_write(ops, ordered=False)).bulk_api_result
+    except BulkWriteError as e:
+        res = e.details
+        errors = [err for err in res['writeErrors'] if err.get('code') != _DUPLICATE_KEY]
+        if errors:
+            logger.error(f"Job ingest failed for {len(errors)} of {len(ops)} jobs: {errors[0].get('errmsg')}")
+            raise
+    rejected = {err['index'] for err in res.get('writeErrors', ())}
+    upserted = {u['index']: u['_id'] for u in res.get('upserted', ())}
+    if rejected:
+        logger.debug(f"{len(rejected)} jobs already stored under another URL")
+
+    changed = []
+    for i, doc in enumerate(op_docs):
+        if i in upserted:
+            changed.append(dict(doc, _id=upserted[i]))
+        elif i not in rejected and i not in upsert_ops:
+            changed.append(doc)
+    batch = IngestResult(
+        inserted=len(upserted),
+        updated=len(changed) - len(upserted),
+        # rejected jobs, and upserts that matched a document inserted concurrently
+        skipped=skipped + len(ops) - len(changed),
+    )
+    if changed:
+        await on_jobs_inserted(changed)
+    return batch
+
+
+async def _stored_documents(col, keys: List[tuple]) -> dict:
+    """Stored jobs by ('url_hash' | 'fingerprint', value) key, for the given keys."""
+    query = {'$or': [
+        {field: {'$in': [value for f, value in keys if f == field]}}
+        for field in ('url_hash', 'fingerprint')
+    ]}
+    wanted = set(keys)
+    found = {}
+    async for doc in col.find(query):
+        for field in ('url_hash', 'fingerprint'):
+            key = (field, doc.get(field))
+            if key in wanted:
+                found[key] = doc
+    return found
@@ -0,0 +1,266 @@
+"""Streaming scrape ingest: fetch -> normalize -> embed -> store.
+
+The four stages run concurrently and are connected by bounded queues of
+INGEST_QUEUE_SIZE jobs. A slow stage blocks the stage before it, so postings
+never pile up in memory and a scrape of any size holds at most a few queues'
+worth of jobs. The embed stage batches up to INGEST_EMBED_BATCH jobs per model
+call, and the store stage up to INGEST_BATCH_SIZE jobs per bulk upsert. Both
+take whatever is already queued rather than waiting to fill a batch.
+
+Each stage records the jobs it handled, the time it spent working (not
+waiting on a queue) and the depth of its input queue. `IngestPipeline.stats()`
+can be read while the pipeline runs.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.executors import run_in_model_pool
+from app.ingest import IngestResult, add_skills, content_hash, ingest_jobs, job_keys, select_for_embedding
+from app.nlp.embeddings import embed_jobs
+from scrapers import api_scraper
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name: str, queue: Optional[asyncio.Queue] = None):
+        self.name = name
+        self.queue = queue
+        # tasks working in parallel; busy time is summed over all of them
+        self.workers = 1
+        self.items = 0
+        self.dropped = 0
+        self.batches = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.started = None
+        self.finished = None
+
+    def observe(self):
+        if self.started is None:
+            self.started = time.perf_counter()
+        if self.queue is not None:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def as_dict(self) -> dict:
+        end = self.finished or time.perf_counter()
+        elapsed = end - self.started if self.started is not None else 0.0
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'workers': self.workers,
+            'busy_seconds': round(self.busy, 3),
+            'items_per_second': round(self.items / elapsed, 1) if elapsed else None,
+            # share of the stage's wall time spent working: the bottleneck is close to 1
+            'utilization': round(self.busy / (elapsed * self.workers), 3) if elapsed else None,
+            'queue_depth': self.queue.qsize() if self.queue is not None else None,
+            'max_queue_depth': self.max_depth if self.queue is not None else None,
+        }
+
+
+async def _next_batch(queue: asyncio.Queue, size: int):
+    """Wait for one item, then take what is already queued, up to `size`.
+
+    Returns (batch, done); `done` is set once the end-of-stream marker was read.
+    """
+    item = await queue.get()
+    if item is _DONE:
+        return [], True
+    batch = [item]
+    while len(batch) < size and not queue.empty():
+        item = queue.get_nowait()
+        if item is _DONE:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+class IngestPipeline:
+    def __init__(self, queue_size: Optional[int] = None, embed_batch: Optional[int] = None,
+                 store_batch: Optional[int] = None):
+        queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.embed_batch = embed_batch or settings.INGEST_EMBED_BATCH
+        self.store_batch = store_batch or settings.INGEST_BATCH_SIZE
+        self._normalize_in = asyncio.Queue(queue_size)
+        self._embed_in = asyncio.Queue(queue_size)
+        self._store_in = asyncio.Queue(queue_size)
+        self._stages = {
+            'fetch': StageStats('fetch'),
+            'normalize': StageStats('normalize', self._normalize_in),
+            'embed': StageStats('embed', self._embed_in),
+            'store': StageStats('store', self._store_in),
+        }
+        self.embedded = 0
+        self.result = IngestResult()
+        self._started = None
+        self._finished = None
+
+    async def run(self, requests: Iterable, fetch: Callable[[object], Awaitable[list]],
+                  parse: Callable[[dict], dict], concurrency: int,
+                  fallback: Optional[Callable[[], List[dict]]] = None) -> IngestResult:
+        """Ingest every record returned by `fetch(request)` for each request.
+
+        `concurrency` fetches run at once. When no record was fetched, the already
+        parsed jobs from `fallback()` are ingested instead.
+        """
+        self._started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._fetch(requests, fetch, parse, concurrency, fallback)),
+            asyncio.create_task(self._normalize()),
+            asyncio.create_task(self._embed()),
+            asyncio.create_task(self._store()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self._finished = time.perf_counter()
+        stages = ', '.join(
+            f"{s['stage']} {s['items']} @ {s['items_per_second']}/s (max queue {s['max_queue_depth']})"
+            for s in self.stats()['stages']
+        )
+        logger.info(f"Ingest pipeline done in {self._finished - self._started:.2f}s: {stages}; {self.result.as_dict()}")
+        return self.result
+
+    async def _fetch(self, requests, fetch, parse, concurrency, fallback):
+        stats = self._stages['fetch']
+        stats.workers = max(1, concurrency)
+        pending = iter(requests)
+
+        async def worker():
+            # workers share one iterator; each takes the next request when it is free
+            for request in pending:
+                stats.observe()
+                started = time.perf_counter()
+                records = await fetch(request)
+                stats.busy += time.perf_counter() - started
+                stats.batches += 1
+                stats.items += len(records)
+                for record in records:
+                    await self._normalize_in.put((parse, record))
+
+        await asyncio.gather(*[worker() for _ in range(stats.workers)])
+        if not stats.items and fallback is not None:
+            logger.info("No jobs fetched, ingesting fallback jobs")
+            for job in fallback():
+                stats.observe()
+                stats.items += 1
+                await self._normalize_in.put((None, job))
+        stats.finished = time.perf_counter()
+        await self._normalize_in.put(_DONE)
+
+    async def _normalize(self):
+        stats = self._stages['normalize']
+        seen = set()
+        while True:
+            stats.observe()
+            item = await self._normalize_in.get()
+            if item is _DONE:
+                break
+            started = time.perf_counter()
+            parse, record = item
+            job, keys = None, ()
+            try:
+                job = parse(record) if parse is not None else record
+            except Exception as e:
+                logger.warning(f"Skipping unparseable record: {e}")
+            if job is not None and job.get('title'):
+                job.update(job_keys(job))
+                job['content_hash'] = content_hash(job)
+                add_skills(job)
+                keys = [job['fingerprint']] + ([job['url_hash']] if 'url_hash' in job else [])
+            stats.busy += time.perf_counter() - started
+            # a repeated URL or title/company would be skipped by ingest: do not embed it
+            if not keys or any(key in seen for key in keys):
+                stats.dropped += 1
+                continue
+            seen.update(keys)
+            stats.items += 1
+            await self._embed_in.put(job)
+        stats.finished = time.perf_counter()
+        await self._embed_in.put(_DONE)
+
+    async def _embed(self):
+        stats = self._stages['embed']
+        done = False
+        while not done:
+            stats.observe()
+            batch, done = await _next_batch(self._embed_in, self.embed_batch)
+            if not batch:
+                continue
+            started = time.perf_counter()
+            to_embed = await select_for_embedding(batch)
+            if to_embed:
+                await run_in_model_pool(embed_jobs, to_embed)
+            stats.busy += time.perf_counter() - started
+            stats.batches += 1
+            stats.items += len(batch)
+            self.embedded += len(to_embed)
+            for job in batch:
+                await self._store_in.put(job)
+        stats.finished = time.perf_counter()
+        await self._store_in.put(_DONE)
+
+    async def _store(self):
+        stats = self._stages['store']
+        done = False
+        while not done:
+            stats.observe()
+            batch, done = await _next_batch(self._store_in, self.store_batch)
+            if not batch:
+                continue
+            started = time.perf_counter()
+            self.result += await ingest_jobs(batch)
+            stats.busy += time.perf_counter() - started
+            stats.batches += 1
+            stats.items += len(batch)
+        stats.finished = time.perf_counter()
+
+    def stats(self) -> dict:
+        end = self._finished or time.perf_counter()
+        return {
+            'running': self._started is not None and self._finished is None,
+            'elapsed_seconds': round(end - self._started, 3) if self._started is not None else 0.0,
+            'embedded': self.embedded,
+            'result': self.result.as_dict(),
+            'stages': [stage.as_dict() for stage in self._stages.values()],
+        }
+
+
+async def ingest_jsearch(pipeline: IngestPipeline, query_list: List[str], location: str, limit: int,
+                         pages: int = 1, concurrency: Optional[int] = None,
+                         allow_mock: bool = True) -> IngestResult:
+    """Stream JSearch results for every (query, page) through `pipeline`.
+
+    Concurrent counterpart of `api_scraper.scrape_jobs_with_api` plus
+    `ingest_jobs`. `limit` caps the jobs taken from each page.
+    """
+    api_key = os.getenv('RAPIDAPI_KEY')
+    requests = []
+    if api_key:
+        requests = [(q, page) for q in query_list for page in range(1, pages + 1)]
+    else:
+        logger.warning("No RAPIDAPI_KEY found in .env")
+
+    async def fetch(request):
+        keyword, page = request
+        records = await api_scraper.fetch_jsearch_records(keyword, location, api_key, page)
+        return records[:limit]
+
+    fallback = (lambda: api_scraper.mock_jobs(limit)) if allow_mock else None
+    return await pipeline.run(
+        requests, fetch, api_scraper.parse_job,
+        concurrency or settings.JSEARCH_CONCURRENCY, fallback,
+    )
@@ -1,7 +1,13 @@
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
+from app.core.executors import run_in_model_pool, shutdown_executors
+from app.db import ensure_indexes
+from app.nlp.embeddings import model_status, warm_up_model
 from app.routes import auth, candidates, jobs, admin
+from app.scrape_scheduler import scrape_scheduler
+from scrapers.api_scraper import close_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +28,43 @@ app.add_middleware(
     max_age=3600,
 )
 
+
+@app.on_event("startup")
+async def create_indexes():
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not ensure MongoDB indexes: {e}")
+
+
+@app.on_event("startup")
+async def preload_model():
+    """Load and warm the embedding model before serving (a no-op load if the
+    process inherited it from a preloading parent, see gunicorn_conf.py)."""
+    if not settings.PRELOAD_MODEL:
+        return
+    try:
+        await run_in_model_pool(warm_up_model)
+    except Exception as e:
+        # e.g. OSError when the model cannot be fetched: serve anyway, embedding paths degrade
+        logging.getLogger(__name__).warning(f"Embedding model not preloaded: {e}")
+        return
+    logging.getLogger(__name__).info(f"Embedding model ready: {model_status()}")
+
+
+@app.on_event("startup")
+async def start_scrape_scheduler():
+    if settings.SCRAPE_SCHEDULER_ENABLED:
+        scrape_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_executors():
+    await scrape_scheduler.stop()
+    await close_http_client()
+    shutdown_executors()
+
+
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(candidates.router, prefix="/candidates", tags=["candidates"])
 app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson.objectid import ObjectId
+
+from app.core.config import settings
+from app.nlp.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+def load_faiss():
+    try:
+        import faiss
+    except Exception as e:
+        raise RuntimeError("faiss not available. Install faiss-cpu or use MATCH_BACKEND=exact: " + str(e))
+    return faiss
+
+
+def _ids_path(index_path: str) -> str:
+    return index_path + ".ids.npy"
+
+
+def build_ann_index(ids: List[ObjectId], matrix: np.ndarray, path: str, nlist: Optional[int] = None) -> int:
+    """Train an IVF index on L2-normalized `matrix` and write it (plus the id table) to `path`.
+
+    FAISS labels are row positions; the ObjectId for each label is stored alongside the
+    index as an (n, 12) uint8 array. Returns the number of inverted lists used.
+    """
+    faiss = load_faiss()
+    n, dim = matrix.shape
+    # ~4*sqrt(n) lists keeps list sizes reasonable; FAISS wants >= 39 training points per list
+    nlist = nlist or settings.ANN_NLIST
+    nlist = max(1, min(nlist, int(4 * math.sqrt(n)), n // 39 or 1))
+
+    quantizer = faiss.IndexFlatIP(dim)
+    index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+    train = matrix
+    if n > 256 * nlist:
+        sample = np.random.default_rng(0).choice(n, 256 * nlist, replace=False)
+        train = matrix[sample]
+    index.train(np.ascontiguousarray(train, dtype=np.float32))
+    index.add_with_ids(np.ascontiguousarray(matrix, dtype=np.float32), np.arange(n, dtype=np.int64))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    id_bytes = np.frombuffer(b''.join(_id.binary for _id in ids), dtype=np.uint8).reshape(n, 12)
+    # write to temp files and swap, so a running server never maps a half-written index
+    faiss.write_index(index, path + ".tmp")
+    with open(_ids_path(path) + ".tmp", 'wb') as f:
+        np.save(f, id_bytes)
+    os.replace(_ids_path(path) + ".tmp", _ids_path(path))
+    os.replace(path + ".tmp", path)
+    return nlist
+
+
+class AnnIndex:
+    """Approximate job index: a memory-mapped FAISS IVF base plus an exact in-memory delta.
+
+    The base is built offline (see `rebuild_ann_index.py`) and is read-only once mapped.
+    Jobs added after the build land in a `VectorIndex` delta that is searched exactly
+    and merged with the base results; deletions are masked out at query time.
+    """
+
+    def __init__(self, path: str, nprobe: int):
+        self.path = path
+        self.nprobe = nprobe
+        self.delta = VectorIndex('jobs')
+        self._index = None
+        self._ids: List[ObjectId] = []
+        self._labels = {}
+        self._removed = set()
+        self._mtime = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        base = self._index.ntotal if self._index is not None else 0
+        return base - len(self._removed) + len(self.delta)
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def available(self) -> bool:
+        return os.path.exists(self.path) and os.path.exists(_ids_path(self.path))
+
+    async def ensure_loaded(self):
+        if self._index is None or self._stale():
+            async with self._lock:
+                if self._index is None or self._stale():
+                    self._open()
+        await self.delta.ensure_loaded()
+
+    def _stale(self) -> bool:
+        # a rebuild swaps the file in place; pick it up on the next query
+        try:
+            return os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return False
+
+    def _open(self):
+        faiss = load_faiss()
+        started = time.perf_counter()
+        mtime = os.path.getmtime(self.path)
+        index = faiss.read_index(self.path, faiss.IO_FLAG_MMAP)
+        index.nprobe = self.nprobe
+        id_bytes = np.load(_ids_path(self.path), mmap_mode='r')
+        ids = [ObjectId(row.tobytes()) for row in id_bytes]
+
+        self._index = index
+        self._ids = ids
+        self._labels = {_id: label for label, _id in enumerate(ids)}
+        self._removed = set()
+        self._mtime = mtime
+        # everything newer than the build goes to the exact delta
+        self.delta = VectorIndex('jobs', after_id=max(ids) if ids else None)
+        logger.info(
+            f"Mapped ANN index {self.path}: {index.ntotal} vectors, nlist={index.nlist}, "
+            f"nprobe={self.nprobe} in {time.perf_counter() - started:.2f}s"
+        )
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        docs = list(docs)
+        added = self.delta.add_documents(docs)
+        for doc in docs:
+            label = self._labels.get(doc.get('_id'))
+            if label is not None and doc['_id'] in self.delta:
+                # updated in place: shadow the stale base vector with the delta row
+                self._removed.add(label)
+        return added
+
+    def remove(self, ids: Iterable) -> int:
+        ids = list(ids)
+        removed = self.delta.remove(ids)
+        for _id in ids:
+            label = self._labels.get(_id)
+            if label is not None and label not in self._removed:
+                self._removed.add(label)
+                removed += 1
+        return removed
+
+    def search(self, query, k: int) -> List[Tuple[object, float]]:
+        if k <= 0:
+            return []
+        hits = self.delta.search(query, k)
+        if self._index is not None and self._index.ntotal:
+            q = np.asarray(query, dtype=np.float32)
+            norm = np.linalg.norm(q)
+            if q.shape == (self._index.d,) and norm:
+                fetch = min(k + len(self._removed), self._index.ntotal)
+                scores, labels = self._index.search((q / norm).reshape(1, -1), fetch)
+                for score, label in zip(scores[0], labels[0]):
+                    if label < 0 or label in self._removed:
+                        continue
+                    hits.append((self._ids[label], float(score)))
+        hits.sort(key=lambda h: h[1], reverse=True)
+        return hits[:k]
@@ -0,0 +1,77 @@
+"""Per-row attribute columns kept alongside a `VectorIndex` matrix.
+
+Each column is a NumPy array with one entry per matrix row, so a filter becomes a
+boolean row mask without touching MongoDB. String attributes are dictionary
+encoded: a predicate is evaluated once per distinct value and the resulting
+lookup table is gathered through the row codes.
+"""
+from datetime import datetime, timezone
+from typing import Callable, List
+
+import numpy as np
+
+
+class CategoryColumn:
+    """Dictionary-encoded string attribute: an int32 code per row into `values`."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes = {}
+        self.data = np.zeros(0, dtype=np.int32)
+
+    def _encode(self, value) -> int:
+        value = '' if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def resize(self, capacity: int, size: int):
+        data = np.zeros(capacity, dtype=np.int32)
+        data[:size] = self.data[:size]
+        self.data = data
+
+    def set(self, row: int, value):
+        self.data[row] = self._encode(value)
+
+    def move(self, src: int, dst: int):
+        self.data[dst] = self.data[src]
+
+    def mask(self, predicate: Callable[[str], bool], size: int) -> np.ndarray:
+        table = np.fromiter((bool(predicate(v)) for v in self.values), dtype=bool, count=len(self.values))
+        if not len(table):
+            return np.zeros(size, dtype=bool)
+        return table[self.data[:size]]
+
+
+class TimeColumn:
+    """Datetime attribute as float64 POSIX seconds (naive values are UTC); NaN when missing."""
+
+    def __init__(self):
+        self.data = np.zeros(0, dtype=np.float64)
+
+    @staticmethod
+    def to_timestamp(value) -> float:
+        if not isinstance(value, datetime):
+            return np.nan
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+    def resize(self, capacity: int, size: int):
+        data = np.full(capacity, np.nan, dtype=np.float64)
+        data[:size] = self.data[:size]
+        self.data = data
+
+    def set(self, row: int, value):
+        self.data[row] = self.to_timestamp(value)
+
+    def move(self, src: int, dst: int):
+        self.data[dst] = self.data[src]
+
+    def mask(self, predicate: Callable[[np.ndarray], np.ndarray], size: int) -> np.ndarray:
+        return np.asarray(predicate(self.data[:size]), dtype=bool)
+
+
+COLUMN_TYPES = {'category': CategoryColumn, 'time': TimeColumn}
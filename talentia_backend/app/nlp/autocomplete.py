@@ -0,0 +1,271 @@
+"""Type-ahead suggestions from job titles, companies and skills.
+
+Every distinct phrase (per kind) is stored once with the number of jobs using it.
+Its lookup keys (the phrase and each of its word suffixes, so "dev" also finds
+"Senior Developer") live in one sorted list; a prefix query is a `bisect` to the
+first key plus a short forward scan. Results are memoized per prefix until the
+next ingest, so popular prefixes are answered without scanning.
+
+One- and two-character prefixes match too many keys for a bounded scan, so each
+keeps the _TOP_K most used phrases it matches (see `_TopPhrases`). The list is
+built by one full scan on first use and then updated as counts change.
+
+Skills come from the `skills` field that ingest stores with every job (see
+`app.ingest.add_skills`); descriptions are never read. The initial load, including
+the sort of the keys, runs in a worker thread.
+"""
+import asyncio
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache import LRUCache
+from app.nlp.collection_index import CollectionIndex
+
+KINDS = ('title', 'company', 'skill')
+
+_NON_WORD_RE = re.compile(r'[^\w+#./ -]+')
+# word suffixes indexed per phrase, and keys inspected per query
+_MAX_WORD_KEYS = 6
+_MAX_SCAN = 5000
+# new keys per batch inserted one by one; larger batches are sorted in lazily
+_MAX_INSORT = 64
+# prefixes up to this length are answered from a maintained top list of _TOP_K phrases
+_SHORT_PREFIX = 2
+_TOP_K = 50
+
+
+def normalize_phrase(text: str) -> str:
+    text = (text or '').lower()
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_NON_WORD_RE.sub(' ', text).split())
+
+
+class _Phrase:
+    __slots__ = ('text', 'kind', 'count', 'keys', 'short')
+
+    def __init__(self, text: str, kind: str, keys: Tuple[str, ...]):
+        self.text = text
+        self.kind = kind
+        self.count = 0
+        self.keys = keys
+        # short prefix -> whether the phrase itself (not only a later word) starts with it
+        short = {}
+        for i, key in enumerate(keys):
+            for n in range(1, min(len(key), _SHORT_PREFIX) + 1):
+                short[key[:n]] = short.get(key[:n], False) or i == 0
+        self.short = tuple(short.items())
+
+
+class _TopPhrases:
+    """The most used phrases matching one short prefix, kept up to date incrementally.
+
+    Every phrase left out ranks at most `floor`, so the tracked phrases ranking at
+    least `floor` are exactly the top ones. Counts only move by one, so a phrase that
+    overtakes the list is admitted as it grows; when fewer than `limit` tracked
+    phrases are known to be on top, the list is rebuilt.
+    """
+    __slots__ = ('rank', 'floor')
+
+    def __init__(self, ranked: List[tuple]):
+        # ranked: ((kind, norm), (starts, count)) pairs, best first, up to _TOP_K + 1
+        self.rank = dict(ranked[:_TOP_K])
+        self.floor = ranked[_TOP_K][1] if len(ranked) > _TOP_K else None
+
+    def update(self, key: Tuple[str, str], rank: Tuple[bool, int]):
+        if not rank[1]:
+            self.rank.pop(key, None)
+        elif key in self.rank or self.floor is None or rank > self.floor:
+            self.rank[key] = rank
+            if len(self.rank) > _TOP_K:
+                evicted = min(self.rank, key=self.rank.get)
+                evicted_rank = self.rank.pop(evicted)
+                self.floor = evicted_rank if self.floor is None else max(self.floor, evicted_rank)
+        # a phrase left out that lost a job still ranks below `floor`
+
+    def best(self, limit: int) -> Optional[List[Tuple[str, str]]]:
+        ranked = sorted(self.rank, key=self.rank.get, reverse=True)
+        if self.floor is not None:
+            ranked = [key for key in ranked if self.rank[key] >= self.floor]
+            if len(ranked) < limit:
+                return None
+        return ranked[:limit]
+
+
+class PrefixIndex(CollectionIndex):
+    """Sorted-array prefix index over the phrases of a job collection."""
+
+    projection = {'title': 1, 'company': 1, 'skills': 1}
+    load_in_thread = True
+
+    def __init__(self, collection: str):
+        super().__init__(collection)
+        self._phrases: Dict[Tuple[str, str], _Phrase] = {}
+        self._keys: List[Tuple[str, str, str]] = []
+        self._keys_sorted = True
+        self._docs: Dict[object, Tuple[Tuple[str, str], ...]] = {}
+        self._top: Dict[Tuple[str, Optional[str]], _TopPhrases] = {}
+        self._memo = LRUCache(4096)
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _doc_phrases(doc: dict) -> Dict[Tuple[str, str], str]:
+        # postings stored before ingest extracted skills get them on their next re-scrape
+        skills = doc.get('skills') or ()
+        found = {}
+        for kind, values in (('title', [doc.get('title')]), ('company', [doc.get('company')]), ('skill', skills)):
+            for value in values:
+                if not isinstance(value, str):
+                    continue
+                norm = normalize_phrase(value)
+                if norm:
+                    found.setdefault((kind, norm), ' '.join(value.split()))
+        return found
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        added = 0
+        changed = False
+        created = {}
+        for doc in docs:
+            _id = doc.get('_id')
+            if _id is None:
+                continue
+            if _id in self._docs:
+                self._release(self._docs.pop(_id))
+            else:
+                added += 1
+            phrases = self._doc_phrases(doc)
+            for (kind, norm), text in phrases.items():
+                phrase = self._phrases.get((kind, norm))
+                if phrase is None:
+                    words = norm.split()
+                    keys = tuple(' '.join(words[i:]) for i in range(min(len(words), _MAX_WORD_KEYS)))
+                    phrase = self._phrases[(kind, norm)] = _Phrase(text, kind, keys)
+                    created[(kind, norm)] = phrase
+                phrase.count += 1
+                self._update_top(phrase, norm)
+            self._docs[_id] = tuple(phrases)
+            changed = True
+        # a phrase created and released again within the batch has no keys to insert
+        self._insert_keys([
+            (key, kind, norm) for (kind, norm), phrase in created.items()
+            if self._phrases.get((kind, norm)) is phrase for key in phrase.keys
+        ])
+        if changed:
+            self._memo.clear()
+        return added
+
+    async def _load_from_db(self, after_id=None) -> int:
+        initial = not self._loaded
+        added = await super()._load_from_db(after_id)
+        if initial:
+            # sort and rank one-letter prefixes now, off the event loop, instead of on
+            # the first suggest
+            await asyncio.to_thread(self._build_letter_tops)
+        return added
+
+    def _build_letter_tops(self):
+        for letter in sorted({key[0][0] for key in self._sorted_keys()}):
+            self._top_phrases(letter, None, 1)
+
+    def _insert_keys(self, new_keys: List[Tuple[str, str, str]]):
+        if new_keys and (len(new_keys) > _MAX_INSORT or not self._keys_sorted):
+            # bulk loads append and sort once on the next lookup, instead of an O(n)
+            # list insert per key
+            self._keys.extend(new_keys)
+            self._keys_sorted = False
+            return
+        for key in new_keys:
+            insort(self._keys, key)
+
+    def _sorted_keys(self) -> List[Tuple[str, str, str]]:
+        if not self._keys_sorted:
+            self._keys.sort()
+            self._keys_sorted = True
+        return self._keys
+
+    def _release(self, phrase_keys: Tuple[Tuple[str, str], ...]):
+        keys = self._sorted_keys()
+        for kind, norm in phrase_keys:
+            phrase = self._phrases[(kind, norm)]
+            phrase.count -= 1
+            self._update_top(phrase, norm)
+            if phrase.count:
+                continue
+            del self._phrases[(kind, norm)]
+            for key in phrase.keys:
+                pos = bisect_left(keys, (key, kind, norm))
+                if pos < len(keys) and keys[pos] == (key, kind, norm):
+                    del keys[pos]
+
+    def _update_top(self, phrase: _Phrase, norm: str):
+        if not self._top:
+            return
+        key = (phrase.kind, norm)
+        for prefix, starts in phrase.short:
+            for kind in (None, phrase.kind):
+                top = self._top.get((prefix, kind))
+                if top is not None:
+                    top.update(key, (starts, phrase.count))
+
+    def _top_phrases(self, prefix: str, kind: Optional[str], limit: int) -> List[Tuple[str, str]]:
+        top = self._top.get((prefix, kind))
+        best = top.best(limit) if top is not None else None
+        if best is None:
+            ranked = self._scan(prefix, kind, None)
+            top = self._top[(prefix, kind)] = _TopPhrases(heapq.nlargest(_TOP_K + 1, ranked, key=lambda item: item[1]))
+            best = top.best(limit)
+        return best
+
+    def _scan(self, prefix: str, kind: Optional[str], max_keys: Optional[int]) -> List[tuple]:
+        """((kind, norm), (starts, count)) of the phrases with a key starting with `prefix`."""
+        keys = self._sorted_keys()
+        seen = {}
+        pos = bisect_left(keys, (prefix,))
+        end = len(keys) if max_keys is None else min(len(keys), pos + max_keys)
+        while pos < end and keys[pos][0].startswith(prefix):
+            key, phrase_kind, norm = keys[pos]
+            pos += 1
+            if kind and phrase_kind != kind:
+                continue
+            if seen.get((phrase_kind, norm)) is not True:
+                seen[(phrase_kind, norm)] = norm.startswith(prefix)
+        return [(k, (starts, self._phrases[k].count)) for k, starts in seen.items()]
+
+    def remove(self, ids: Iterable) -> int:
+        removed = 0
+        for _id in ids:
+            phrase_keys = self._docs.pop(_id, None)
+            if phrase_keys is not None:
+                self._release(phrase_keys)
+                removed += 1
+        if removed:
+            self._memo.clear()
+        return removed
+
+    def suggest(self, prefix: str, limit: int = 10, kind: Optional[str] = None) -> List[dict]:
+        """Most used phrases with a word starting with `prefix`; phrase-initial matches first."""
+        prefix = normalize_phrase(prefix)
+        if not prefix:
+            return []
+        memo = self._memo.get((prefix, limit, kind))
+        if memo is not None:
+            return memo
+        if len(prefix) <= _SHORT_PREFIX and limit <= _TOP_K:
+            best = self._top_phrases(prefix, kind, limit)
+        else:
+            # longer prefixes match few keys; past _MAX_SCAN keys the scan is cut short
+            ranked = self._scan(prefix, kind, _MAX_SCAN)
+            best = [k for k, _ in heapq.nlargest(limit, ranked, key=lambda item: item[1])]
+        suggestions = [
+            {'text': self._phrases[k].text, 'kind': k[0], 'count': self._phrases[k].count}
+            for k in best
+        ]
+        self._memo.set((prefix, limit, kind), suggestions)
+        return suggestions
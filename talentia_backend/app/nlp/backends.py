@@ -0,0 +1,188 @@
+"""Pluggable CPU inference backends for the sentence-embedding model.
+
+Selected with EMBEDDING_BACKEND:
+
+- ``torch``: plain SentenceTransformer (fp32), the reference.
+- ``torch-int8``: the same model with its Linear layers dynamically quantized to int8.
+- ``onnx``: the transformer exported to ONNX and run with ONNX Runtime.
+- ``onnx-int8``: the ONNX export with int8 dynamically quantized weights.
+
+Every backend exposes ``encode(texts, batch_size=..., show_progress_bar=False)``
+returning a float32 array, the subset of the SentenceTransformer API the app uses.
+Run ``benchmark_embeddings.py`` to compare throughput and agreement with fp32.
+"""
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+
+
+def _load_sentence_transformer(model_name: str):
+    try:
+        # import inside function to avoid top-level import errors
+        from sentence_transformers import SentenceTransformer
+    except Exception as e:
+        raise RuntimeError(
+            "sentence-transformers not available. Install dependencies or check versions: " + str(e)
+        )
+    return SentenceTransformer(model_name, device='cpu')
+
+
+class EmbeddingBackend(ABC):
+    name = 'base'
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        """Embed `texts` into a float32 array of shape (len(texts), dim)."""
+
+
+class TorchBackend(EmbeddingBackend):
+    name = 'torch'
+
+    def __init__(self, model_name: str):
+        self.model = _load_sentence_transformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        return self.model.encode(
+            texts, batch_size=batch_size, show_progress_bar=show_progress_bar, convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """fp32 SentenceTransformer with int8 dynamic quantization of every nn.Linear."""
+    name = 'torch-int8'
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        import torch
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """Transformer exported to ONNX; tokenization, pooling and normalization done here.
+
+    The export (and optional int8 quantization) is written to ONNX_MODEL_DIR on first
+    use and reused afterwards. Once the session is built the PyTorch weights are
+    released; only the tokenizer is kept.
+    """
+    name = 'onnx'
+
+    def __init__(self, model_name: str, quantize: bool = False):
+        try:
+            import onnxruntime as ort
+        except Exception as e:
+            raise RuntimeError("onnxruntime not available. Install it or use EMBEDDING_BACKEND=torch: " + str(e))
+        if quantize:
+            self.name = 'onnx-int8'
+
+        st_model = _load_sentence_transformer(model_name)
+        self.tokenizer = st_model.tokenizer
+        self.max_seq_length = st_model.max_seq_length
+        self.pooling, self.normalize = self._pooling_config(st_model)
+
+        model_dir = os.path.join(settings.ONNX_MODEL_DIR, model_name.replace('/', '__'))
+        fp32_path = os.path.join(model_dir, 'model.onnx')
+        path = os.path.join(model_dir, 'model.int8.onnx') if quantize else fp32_path
+        if not os.path.exists(fp32_path):
+            self._export(st_model, fp32_path)
+        if quantize and not os.path.exists(path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+            logger.info(f"Wrote int8 ONNX model to {path}")
+        del st_model
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.MODEL_POOL_THREADS:
+            options.intra_op_num_threads = settings.MODEL_POOL_THREADS
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @staticmethod
+    def _pooling_config(st_model):
+        from sentence_transformers import models
+        pooling, normalize = None, False
+        for module in st_model:
+            if isinstance(module, models.Pooling):
+                # sentence-transformers 2.x exposes one flag per mode, newer releases a single name
+                config = module.get_config_dict()
+                mode = config.get('pooling_mode')
+                if config.get('pooling_mode_mean_tokens') or mode == 'mean':
+                    pooling = 'mean'
+                elif config.get('pooling_mode_cls_token') or mode == 'cls':
+                    pooling = 'cls'
+            elif isinstance(module, models.Normalize):
+                normalize = True
+        if pooling is None:
+            raise RuntimeError("ONNX backend supports only mean or CLS pooling models")
+        return pooling, normalize
+
+    def _export(self, st_model, path: str):
+        import inspect
+        import torch
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        transformer = st_model[0].auto_model.eval()
+        sample = self.tokenizer(['export sample'], padding=True, return_tensors='pt')
+        names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+        dynamic = {n: {0: 'batch', 1: 'sequence'} for n in names}
+        dynamic['token_embeddings'] = {0: 'batch', 1: 'sequence'}
+
+        class _TokenEmbeddings(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, *inputs):
+                return self.model(**dict(zip(names, inputs)))[0]
+
+        # newer torch defaults to the dynamo exporter; keep the TorchScript one everywhere
+        extra = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+        with torch.no_grad():
+            torch.onnx.export(
+                _TokenEmbeddings(transformer), tuple(sample[n] for n in names), path,
+                input_names=names, output_names=['token_embeddings'],
+                dynamic_axes=dynamic, opset_version=14, **extra,
+            )
+        logger.info(f"Exported ONNX model to {path}")
+
+    def encode(self, texts: List[str], batch_size: int = 32, show_progress_bar: bool = False) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        out = []
+        # sort by length so each batch pads to a similar size, then restore order
+        order = np.argsort([-len(t) for t in texts], kind='stable')
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            enc = self.tokenizer(batch, padding=True, truncation=True,
+                                 max_length=self.max_seq_length, return_tensors='np')
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+            tokens = self.session.run(None, feeds)[0]
+            if self.pooling == 'cls':
+                pooled = tokens[:, 0]
+            else:
+                mask = enc['attention_mask'][..., None].astype(np.float32)
+                pooled = (tokens * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            out.append(pooled.astype(np.float32))
+        vecs = np.empty((len(texts), out[0].shape[1]), dtype=np.float32)
+        vecs[order] = np.concatenate(out)
+        if self.normalize:
+            vecs /= np.clip(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12, None)
+        return vecs
+
+
+def load_backend(name: str, model_name: str) -> EmbeddingBackend:
+    if name == 'torch':
+        return TorchBackend(model_name)
+    if name == 'torch-int8':
+        return QuantizedTorchBackend(model_name)
+    if name in ('onnx', 'onnx-int8'):
+        return OnnxBackend(model_name, quantize=name == 'onnx-int8')
+    raise RuntimeError(f"Unknown EMBEDDING_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
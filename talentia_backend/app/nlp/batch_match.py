@@ -0,0 +1,132 @@
+"""Top-k job matches for many candidates at once.
+
+Candidates are processed in blocks of MATCH_BATCH_BLOCK. Each block is scored as
+one matrix-matrix product against the job matrix, itself walked in slices of
+MATCH_BATCH_JOB_BLOCK rows while a running top-k is kept. Peak memory is one
+(block x job block) score matrix, independent of corpus and request size.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+from bson.objectid import ObjectId
+
+from app.core.config import settings
+from app.db import get_collection
+from app.indexes import get_job_index
+from app.nlp.vector_codec import decode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_blocked(matrix: np.ndarray, ids: np.ndarray, queries: np.ndarray, k: int,
+                  job_block: int) -> List[List[Tuple[object, float]]]:
+    """Top-k rows of L2-normalized `matrix` by cosine similarity for each query row."""
+    n = len(matrix)
+    k = min(k, n)
+    if not k or not len(queries):
+        return [[] for _ in range(len(queries))]
+    norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    queries = (queries / norms).astype(np.float32, copy=False)
+
+    best_scores = best_rows = None
+    for start in range(0, n, job_block):
+        scores = queries @ matrix[start:start + job_block].T
+        kk = min(k, scores.shape[1])
+        rows = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+        top = np.take_along_axis(scores, rows, axis=1)
+        rows += start
+        if best_scores is not None:
+            top = np.concatenate([best_scores, top], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            keep = np.argpartition(-top, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(top, keep, axis=1)
+            rows = np.take_along_axis(rows, keep, axis=1)
+        best_scores, best_rows = top, rows
+
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+    return [
+        [(ids[r], float(s)) for r, s in zip(row_ids, row_scores)]
+        for row_ids, row_scores in zip(best_rows, best_scores)
+    ]
+
+
+async def stream_batch_matches(candidate_ids: List[str], k: int,
+                               block_size: Optional[int] = None) -> AsyncIterator[dict]:
+    """Yield one result dict per candidate, block by block, in request order.
+
+    Each result has `candidate_id` and either `matches` (id, title, company, location,
+    url, similarity) or `error`.
+    """
+    block_size = block_size or settings.MATCH_BATCH_BLOCK
+    candidates_col = get_collection('candidates')
+    jobs_col = get_collection('jobs')
+    index = await get_job_index()
+
+    for start in range(0, len(candidate_ids), block_size):
+        block = candidate_ids[start:start + block_size]
+        object_ids = {}
+        for candidate_id in block:
+            try:
+                object_ids[candidate_id] = ObjectId(candidate_id)
+            except Exception:
+                pass
+        embeddings = {}
+        cursor = candidates_col.find({'_id': {'$in': list(object_ids.values())}}, {'embedding': 1})
+        async for doc in cursor:
+            embeddings[doc['_id']] = decode_embedding(doc.get('embedding'))
+
+        errors, scored, queries = {}, [], []
+        for candidate_id in block:
+            oid = object_ids.get(candidate_id)
+            if oid is None:
+                errors[candidate_id] = 'Invalid candidate ID'
+            elif oid not in embeddings:
+                errors[candidate_id] = 'Candidate not found'
+            elif embeddings[oid] is None:
+                errors[candidate_id] = 'Candidate has no embedding'
+            elif index.dim is not None and len(embeddings[oid]) != index.dim:
+                errors[candidate_id] = 'Candidate embedding does not match the job index'
+            else:
+                scored.append(candidate_id)
+                queries.append(embeddings[oid])
+
+        hits = []
+        if scored:
+            # score off the event loop; rows moved by a concurrent delete invalidate the block
+            epoch, ids, matrix = index.epoch, index.ids.copy(), index.matrix
+            queries = np.asarray(queries, dtype=np.float32)
+            job_block = settings.MATCH_BATCH_JOB_BLOCK
+            hits = await asyncio.to_thread(top_k_blocked, matrix, ids, queries, k, job_block)
+            if index.epoch != epoch:
+                hits = top_k_blocked(index.matrix, index.ids, queries, k, job_block)
+
+        jobs = {}
+        job_ids = list({job_id for row in hits for job_id, _ in row})
+        projection = {'title': 1, 'company': 1, 'location': 1, 'url': 1}
+        async for job in jobs_col.find({'_id': {'$in': job_ids}}, projection):
+            jobs[job['_id']] = job
+
+        results = dict(zip(scored, hits))
+        for candidate_id in block:
+            if candidate_id in errors:
+                yield {'candidate_id': candidate_id, 'error': errors[candidate_id]}
+                continue
+            matches = []
+            for job_id, similarity in results[candidate_id]:
+                job = jobs.get(job_id)
+                if not job:
+                    continue
+                matches.append({
+                    'id': str(job_id),
+                    'title': job.get('title'),
+                    'company': job.get('company'),
+                    'location': job.get('location'),
+                    'url': job.get('url'),
+                    'similarity': similarity,
+                })
+            yield {'candidate_id': candidate_id, 'matches': matches}
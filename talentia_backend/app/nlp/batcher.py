@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.executors import run_in_model_pool
+from app.nlp.embedding_cache import normalize_text
+from app.nlp.embeddings import embed_texts
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embed requests into a single `model.encode` call.
+
+    Requests are queued until either `max_batch` texts are waiting or `max_wait_ms`
+    has passed since the first one arrived; the batch is then encoded off the event
+    loop and each caller's future is resolved with its own vector.
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+
+    async def embed(self, text: str) -> list:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((text, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            # keep a reference so the task is not garbage collected mid-flight
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in batch]
+        try:
+            vecs = await run_in_model_pool(embed_texts, texts)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for (_, fut), vec in zip(batch, vecs):
+            if not fut.done():
+                fut.set_result(vec)
+
+    def stats(self) -> dict:
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+            'pending': len(self._pending),
+        }
+
+
+batcher = EmbeddingBatcher(settings.EMBED_BATCH_SIZE, settings.EMBED_BATCH_WAIT_MS)
+
+
+async def embed_text_async(text: str) -> list:
+    """Awaitable `embed_text` that shares model calls with concurrent requests."""
+    return await batcher.embed(text)
+
+
+async def embed_texts_async(texts: List[str]) -> List[list]:
+    """Awaitable `embed_texts`; the list is already a batch, so it goes straight to the model pool."""
+    if not texts:
+        return []
+    return await run_in_model_pool(embed_texts, texts)
+
+
+# popular search queries repeat verbatim; answer them without a model-pool round trip
+query_cache = LRUCache(settings.QUERY_EMBEDDING_CACHE_SIZE)
+
+
+async def embed_query_async(query: str) -> list:
+    """Embed a search query; queries equal up to case and whitespace share one vector."""
+    key = normalize_text(query).lower()
+    vec = query_cache.get(key)
+    if vec is None:
+        vec = await embed_text_async(key)
+        query_cache.set(key, vec)
+    return vec
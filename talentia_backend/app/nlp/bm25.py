@@ -0,0 +1,192 @@
+"""In-process BM25 keyword index over job postings.
+
+Field text is tokenized (lowercased, accents stripped, stopwords dropped) and each
+field contributes its term counts multiplied by a weight, so a term in the title
+counts more than one buried in the description. Postings are compact
+`array('i')` row / `array('f')` weighted term-frequency pairs; a query scores only
+the posting lists of its terms, vectorized with NumPy.
+
+Removed or updated documents are tombstoned and their rows are reclaimed by
+compaction once they make up half of the index.
+"""
+import logging
+import math
+import re
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.nlp.collection_index import CollectionIndex
+
+logger = logging.getLogger(__name__)
+
+FIELD_WEIGHTS = {'title': 3.0, 'company': 2.0, 'description': 1.0}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# jobs are scraped in English and French
+_STOPWORDS = frozenset('''
+a an and are as at be by for from has have in is it of on or that the this to was we
+were will with you your our
+au aux avec ce ces dans de des du elle en est et il ils la le les leur mais ne nous
+on ou par pas pour qui que sa se ses son sur un une vous l d j n s qu
+'''.split())
+
+
+def tokenize(text: str) -> List[str]:
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return [t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS]
+
+
+def reciprocal_rank_fusion(*rankings: List[Tuple[object, float]], k: int = 60) -> List[Tuple[object, float]]:
+    """Fuse ranked (id, score) lists by summing 1 / (k + rank); scores themselves are ignored."""
+    fused: Dict[object, float] = {}
+    for ranking in rankings:
+        for rank, (_id, _) in enumerate(ranking, start=1):
+            fused[_id] = fused.get(_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index(CollectionIndex):
+    """BM25 ranking over weighted text fields of one MongoDB collection."""
+
+    # tokenizing the whole corpus takes seconds: build it in a worker thread
+    load_in_thread = True
+
+    def __init__(self, collection: str, fields: Optional[Dict[str, float]] = None,
+                 k1: float = 1.2, b: float = 0.75):
+        super().__init__(collection)
+        self.fields = fields or FIELD_WEIGHTS
+        self.projection = {field: 1 for field in self.fields}
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._df: Dict[str, int] = {}
+        self._ids: List[object] = []
+        self._rows: Dict[object, int] = {}
+        self._terms: List[Optional[Tuple[str, ...]]] = []
+        self._lengths = array('f')
+        self._alive = bytearray()
+        self._live = 0
+        self._total_length = 0.0
+
+    def __len__(self):
+        return self._live
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        """Index documents; a document already present is replaced."""
+        added = 0
+        for doc in docs:
+            _id = doc.get('_id')
+            if _id is None:
+                continue
+            if _id in self._rows:
+                self._remove_row(self._rows.pop(_id))
+            else:
+                added += 1
+            self._add_row(_id, doc)
+        self._maybe_compact()
+        return added
+
+    def _add_row(self, _id, doc: dict):
+        counts: Dict[str, float] = {}
+        for field, weight in self.fields.items():
+            value = doc.get(field)
+            if not isinstance(value, str):
+                continue
+            for token in tokenize(value):
+                counts[token] = counts.get(token, 0.0) + weight
+
+        row = len(self._ids)
+        for term, tf in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array('i'), array('f'))
+            posting[0].append(row)
+            posting[1].append(tf)
+            self._df[term] = self._df.get(term, 0) + 1
+
+        length = sum(counts.values())
+        self._ids.append(_id)
+        self._rows[_id] = row
+        self._terms.append(tuple(counts))
+        self._lengths.append(length)
+        self._alive.append(1)
+        self._live += 1
+        self._total_length += length
+
+    def _remove_row(self, row: int):
+        for term in self._terms[row]:
+            self._df[term] -= 1
+        self._terms[row] = None
+        self._alive[row] = 0
+        self._live -= 1
+        self._total_length -= self._lengths[row]
+
+    def remove(self, ids: Iterable) -> int:
+        removed = 0
+        for _id in ids:
+            row = self._rows.pop(_id, None)
+            if row is not None:
+                self._remove_row(row)
+                removed += 1
+        self._maybe_compact()
+        return removed
+
+    def _maybe_compact(self):
+        dead = len(self._ids) - self._live
+        if dead < 1000 or dead < self._live:
+            return
+        alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+        new_row = np.cumsum(alive, dtype=np.int64) - 1
+        postings = {}
+        for term, (rows, tfs) in self._postings.items():
+            if not self._df.get(term):
+                continue
+            rows_np = np.frombuffer(rows, dtype=np.int32)
+            keep = alive[rows_np]
+            postings[term] = (
+                array('i', new_row[rows_np[keep]].astype(np.int32).tobytes()),
+                array('f', np.frombuffer(tfs, dtype=np.float32)[keep].tobytes()),
+            )
+        keep_rows = np.flatnonzero(alive)
+        self._postings = postings
+        self._df = {term: df for term, df in self._df.items() if df}
+        self._ids = [self._ids[r] for r in keep_rows]
+        self._terms = [self._terms[r] for r in keep_rows]
+        self._lengths = array('f', np.frombuffer(self._lengths, dtype=np.float32)[keep_rows].tobytes())
+        self._alive = bytearray(b'\x01' * len(keep_rows))
+        self._rows = {_id: row for row, _id in enumerate(self._ids)}
+        logger.info(f"Compacted {self.collection} BM25 index: dropped {dead} rows")
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[object, float]]:
+        """Return (id, score) pairs for documents matching any query term, best first.
+
+        With `k`, only the `k` best are returned.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._live or (k is not None and k <= 0):
+            return []
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        avg_length = max(self._total_length / self._live, 1e-6)
+        norm = self.k1 * (1.0 - self.b + self.b * lengths / avg_length)
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for term in terms:
+            df = self._df.get(term)
+            if not df:
+                continue
+            idf = math.log(1.0 + (self._live - df + 0.5) / (df + 0.5))
+            rows_buf, tfs_buf = self._postings[term]
+            rows = np.frombuffer(rows_buf, dtype=np.int32)
+            tfs = np.frombuffer(tfs_buf, dtype=np.float32)
+            scores[rows] += idf * tfs * (self.k1 + 1.0) / (tfs + norm[rows])
+        scores[np.frombuffer(bytes(self._alive), dtype=np.uint8) == 0] = 0.0
+
+        hits = np.flatnonzero(scores > 0)
+        if k is not None and k < len(hits):
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return [(self._ids[r], float(scores[r])) for r in hits]
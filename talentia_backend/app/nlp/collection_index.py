@@ -0,0 +1,104 @@
+import asyncio
+import functools
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from app.core.config import settings
+from app.db import get_collection
+
+logger = logging.getLogger(__name__)
+
+_LOAD_BATCH = 10000
+
+
+class CollectionIndex(ABC):
+    """Base for process-local indexes built from one MongoDB collection.
+
+    Documents matching `query` are streamed in `_id` order (only the `projection`
+    fields) on first use and handed to `add_documents` in batches. Afterwards the
+    ingest paths call `add_documents` / `remove` directly, and every
+    INDEX_REFRESH_SECONDS the index reads documents with a greater `_id` to pick up
+    writes made by other processes.
+
+    Indexes that are slow to build set `load_in_thread`: their initial load runs
+    `add_documents` in a worker thread so the event loop keeps serving. Nothing else
+    touches the index meanwhile, since the ingest hooks skip indexes that are not
+    `loaded` and queries wait for the load.
+    """
+
+    query: dict = {}
+    projection: Optional[dict] = None
+    load_in_thread = False
+
+    def __init__(self, collection: str, after_id=None):
+        self.collection = collection
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # only documents with a greater `_id` are read from MongoDB
+        self._last_loaded_id = after_id
+        self._last_refresh = 0.0
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_loaded(self):
+        """Load the index on first use, then pick up documents inserted elsewhere."""
+        if self._loaded and time.monotonic() - self._last_refresh < settings.INDEX_REFRESH_SECONDS:
+            return
+        async with self._lock:
+            if self._loaded and time.monotonic() - self._last_refresh < settings.INDEX_REFRESH_SECONDS:
+                return
+            started = time.perf_counter()
+            added = await self._load_from_db(self._last_loaded_id)
+            self._last_refresh = time.monotonic()
+            if not self._loaded:
+                self._loaded = True
+                logger.info(
+                    f"Loaded {self.collection} {type(self).__name__}: {len(self)} rows in "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+            elif added:
+                logger.info(f"Refreshed {self.collection} {type(self).__name__}: {added} new rows")
+
+    async def _load_from_db(self, after_id=None) -> int:
+        col = get_collection(self.collection)
+        query = dict(self.query)
+        if after_id is not None:
+            query['_id'] = {'$gt': after_id}
+        cursor = col.find(query, self.projection).sort('_id', 1)
+
+        if self.load_in_thread and not self._loaded:
+            add_documents = functools.partial(asyncio.to_thread, self.add_documents)
+        else:
+            add_documents = self._add_now
+
+        added = 0
+        batch = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= _LOAD_BATCH:
+                added += await add_documents(batch)
+                self._last_loaded_id = batch[-1]['_id']
+                batch = []
+        if batch:
+            added += await add_documents(batch)
+            self._last_loaded_id = batch[-1]['_id']
+        return added
+
+    async def _add_now(self, docs: List[dict]) -> int:
+        return self.add_documents(docs)
+
+    @abstractmethod
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        """Add or replace documents; returns the number of new rows."""
+
+    @abstractmethod
+    def remove(self, ids: Iterable) -> int:
+        """Drop documents by id; returns the number removed."""
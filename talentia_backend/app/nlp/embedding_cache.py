@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC unicode with collapsed whitespace."""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def model_id() -> str:
+    """Model identity used in cache keys; quantized backends produce slightly different vectors."""
+    if settings.EMBEDDING_BACKEND == 'torch':
+        return settings.EMBEDDING_MODEL
+    return f"{settings.EMBEDDING_MODEL}@{settings.EMBEDDING_BACKEND}"
+
+
+def cache_key(text: str, model_name: Optional[str] = None) -> str:
+    model_name = model_name or model_id()
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """Persistent embedding tier in a local SQLite file, bounded by `max_rows`.
+
+    Vectors are stored as raw float32 bytes. When the table grows past `max_rows`
+    the least recently used tenth is deleted.
+    """
+
+    def __init__(self, path: str, max_rows: int):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._conn = None
+        self._pid = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork (gunicorn preload): reopen per process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings ('
+                'key TEXT PRIMARY KEY, vector BLOB NOT NULL, used_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS embeddings_used_at ON embeddings (used_at)')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            # stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                rows = self._connect().execute(
+                    f'SELECT key, vector FROM embeddings WHERE key IN ({marks})', chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                now = time.time()
+                self._connect().executemany(
+                    'UPDATE embeddings SET used_at = ? WHERE key = ?', [(now, k) for k in found]
+                )
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._connect().executemany(
+                'INSERT OR REPLACE INTO embeddings (key, vector, used_at) VALUES (?, ?, ?)',
+                [(k, np.asarray(v, dtype=np.float32).tobytes(), now) for k, v in items.items()],
+            )
+            self._writes_since_prune += len(items)
+            if self._writes_since_prune >= max(1, self.max_rows // 100):
+                self._writes_since_prune = 0
+                self._prune()
+
+    def _prune(self):
+        (count,) = self._connect().execute('SELECT COUNT(*) FROM embeddings').fetchone()
+        if count <= self.max_rows:
+            return
+        drop = count - self.max_rows + self.max_rows // 10
+        self._connect().execute(
+            'DELETE FROM embeddings WHERE key IN '
+            '(SELECT key FROM embeddings ORDER BY used_at LIMIT ?)', (drop,)
+        )
+        logger.info(f"Pruned {drop} entries from embedding cache {self.path}")
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by hash(model name + normalized text).
+
+    The in-memory LRU tier answers repeat lookups within a process; the optional disk
+    tier survives restarts and is shared by workers on the same host.
+    """
+
+    def __init__(self, memory_size: int, disk_path: Optional[str] = None, disk_max_rows: int = 0):
+        self.memory = LRUCache(memory_size)
+        self.disk = None
+        if disk_path:
+            try:
+                self.disk = DiskEmbeddingStore(disk_path, disk_max_rows)
+            except Exception as e:
+                logger.warning(f"Persistent embedding cache disabled ({disk_path}): {e}")
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for key in keys:
+            vec = self.memory.get(key)
+            if vec is not None:
+                found[key] = vec
+        remaining = [k for k in keys if k not in found]
+        if remaining and self.disk is not None:
+            try:
+                from_disk = self.disk.get_many(remaining)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                from_disk = {}
+            for key, vec in from_disk.items():
+                self.memory.set(key, vec)
+            found.update(from_disk)
+            self.disk_hits += len(from_disk)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        for key, vec in items.items():
+            self.memory.set(key, vec)
+        if self.disk is not None:
+            try:
+                self.disk.set_many(items)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        lookups = memory['hits'] + self.disk_hits + self.misses
+        return {
+            'memory_hits': memory['hits'],
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (memory['hits'] + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_size': memory['size'],
+            'memory_maxsize': memory['maxsize'],
+            'memory_evictions': memory['evictions'],
+            'disk_size': len(self.disk) if self.disk is not None else None,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    settings.EMBEDDING_CACHE_SIZE,
+    settings.EMBEDDING_CACHE_PATH,
+    settings.EMBEDDING_CACHE_DISK_MAX,
+)
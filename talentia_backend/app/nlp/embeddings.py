@@ -1,40 +1,142 @@
 from app.core.config import settings
+from app.nlp.embedding_cache import cache_key, embedding_cache
+import logging
+import os
+import time
 import numpy as np
-from typing import Optional
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 _model = None
+_model_load_seconds = None
+_model_warm = False
 
 
 def get_model():
-    """Lazily load the SentenceTransformer model. Raises RuntimeError if package not available.
+    """Lazily load the embedding backend selected by EMBEDDING_BACKEND.
 
-    This avoids importing heavy NLP packages at application startup.
+    Raises RuntimeError if the packages it needs are not available. This avoids
+    importing heavy NLP packages at application startup.
     """
-    global _model
+    global _model, _model_load_seconds
     if _model is None:
-        try:
-            # import inside function to avoid top-level import errors
-            from sentence_transformers import SentenceTransformer
-        except Exception as e:
-            raise RuntimeError(
-                "sentence-transformers not available. Install dependencies or check versions: " + str(e)
-            )
-        _model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        from app.nlp.backends import load_backend
+        started = time.perf_counter()
+        _model = load_backend(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL)
+        _model_load_seconds = time.perf_counter() - started
+        logger.info(
+            f"Loaded embedding model {settings.EMBEDDING_MODEL} ({_model.name}) in "
+            f"{_model_load_seconds:.2f}s (pid {os.getpid()})"
+        )
     return _model
 
 
+def warm_up_model():
+    """Load the model and run a dummy batch so the first real request pays no setup cost.
+
+    Goes straight to the model (not the cache) so tokenizer and kernels are exercised.
+    """
+    global _model_warm
+    model = get_model()
+    started = time.perf_counter()
+    model.encode(["warm-up"] * settings.EMBED_BATCH_SIZE, batch_size=settings.EMBED_BATCH_SIZE,
+                 show_progress_bar=False)
+    _model_warm = True
+    logger.info(f"Embedding model warmed up in {time.perf_counter() - started:.2f}s")
+
+
+def _memory_usage_mb() -> dict:
+    """Resident (RSS) and proportional (PSS) memory of this process in MB.
+
+    PSS splits pages shared with other processes (e.g. weights inherited from a
+    preloading parent) between them, so it shows the real cost per worker.
+    """
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    usage[key.lower() + '_mb'] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        import resource
+        # ru_maxrss is KB on Linux and bytes on macOS; this is the peak, not current, RSS
+        usage['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return usage
+
+
+def model_status() -> dict:
+    return {
+        'model': settings.EMBEDDING_MODEL,
+        'backend': settings.EMBEDDING_BACKEND,
+        'loaded': _model is not None,
+        'warm': _model_warm,
+        'load_seconds': round(_model_load_seconds, 3) if _model_load_seconds is not None else None,
+        'pid': os.getpid(),
+        **_memory_usage_mb(),
+    }
+
+
+def embed_texts(texts: List[str]) -> List[list]:
+    """Return one embedding list per text, encoded in a single model call.
+
+    Batching amortizes tokenizer and forward-pass overhead, so callers with several
+    documents (scrapers, re-embedding) should prefer this over repeated `embed_text`.
+    Texts already seen (same model, same normalized text) are served from the
+    embedding cache and only the misses reach the model.
+    """
+    if not texts:
+        return []
+    keys = [cache_key(text) for text in texts]
+    found = embedding_cache.get_many(list(dict.fromkeys(keys)))
+
+    # encode each distinct missing text once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        model = get_model()
+        vecs = model.encode(list(missing.values()), batch_size=settings.EMBED_BATCH_SIZE, show_progress_bar=False)
+        computed = {key: np.asarray(vec, dtype=np.float32) for key, vec in zip(missing, vecs)}
+        embedding_cache.set_many(computed)
+        found.update(computed)
+    return [found[key].tolist() for key in keys]
+
+
+def embed_jobs(jobs: List[dict], texts: Optional[List[str]] = None):
+    """Set `embedding` on every job from one batched `embed_texts` call.
+
+    `texts` defaults to each job's title, company and description. If embedding
+    fails, every job keeps `embedding = None`: ingest then leaves any stored vector
+    in place and the job is embedded again on its next scrape.
+    """
+    if not jobs:
+        return
+    if texts is None:
+        texts = [f"{j.get('title') or ''}\n{j.get('company') or ''}\n{j.get('description') or ''}" for j in jobs]
+    try:
+        embeddings = embed_texts(texts)
+    except Exception as e:
+        logger.warning(f"Embedding failed for {len(jobs)} jobs: {e}")
+        embeddings = [None] * len(jobs)
+    for job, embedding in zip(jobs, embeddings):
+        job['embedding'] = embedding
+
+
 def embed_text(text: str) -> list:
     """Return embedding list for given text. If model missing, raise RuntimeError."""
-    model = get_model()
-    vec = model.encode(text, show_progress_bar=False)
-    return vec.tolist()
+    return embed_texts([text])[0]
 
 
-def cosine_sim(a: Optional[list], b: Optional[list]):
+def cosine_sim(a, b):
+    """Cosine similarity of two embeddings in any stored format (list or packed Binary)."""
+    from app.nlp.vector_codec import decode_embedding
+    a = decode_embedding(a)
+    b = decode_embedding(b)
     if a is None or b is None:
         return 0.0
-    a = np.array(a)
-    b = np.array(b)
     if a.shape != b.shape:
         return 0.0
     num = a.dot(b)
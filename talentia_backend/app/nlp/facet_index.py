@@ -0,0 +1,120 @@
+"""Facet counts over every job, from attribute columns kept current on ingest."""
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.nlp.attribute_columns import COLUMN_TYPES, CategoryColumn
+from app.nlp.collection_index import CollectionIndex
+
+DATE_BUCKETS_DAYS = (1, 7, 30)
+
+
+class FacetIndex(CollectionIndex):
+    """Attribute columns for all documents of a collection, one row per document.
+
+    Unlike the vector index this covers documents without an embedding, so facet
+    counts agree with listing totals. Rows are swap-removed like `VectorIndex`.
+    """
+
+    def __init__(self, collection: str, attributes: Dict[str, str]):
+        super().__init__(collection)
+        self.attributes = attributes
+        self.projection = {field: 1 for field in attributes}
+        self._columns = {field: COLUMN_TYPES[kind]() for field, kind in attributes.items()}
+        self._ids: List[object] = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        added = 0
+        for doc in docs:
+            _id = doc.get('_id')
+            if _id is None:
+                continue
+            row = self._rows.get(_id)
+            if row is None:
+                row = len(self._ids)
+                self._reserve(row + 1)
+                self._ids.append(_id)
+                self._rows[_id] = row
+                added += 1
+            for field, column in self._columns.items():
+                column.set(row, doc.get(field))
+        return added
+
+    def _reserve(self, capacity: int):
+        current = len(next(iter(self._columns.values())).data) if self._columns else capacity
+        if capacity <= current:
+            return
+        new_cap = max(capacity, 2 * current, 1024)
+        for column in self._columns.values():
+            column.resize(new_cap, len(self._ids))
+
+    def remove(self, ids: Iterable) -> int:
+        removed = 0
+        for _id in ids:
+            row = self._rows.pop(_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+                for column in self._columns.values():
+                    column.move(last, row)
+            self._ids.pop()
+            removed += 1
+        return removed
+
+    def mask(self, conditions: Dict[str, Callable], ids: Optional[Iterable] = None) -> np.ndarray:
+        """Rows satisfying every condition (see `VectorIndex.mask`), optionally limited to `ids`."""
+        size = len(self._ids)
+        if ids is None:
+            mask = np.ones(size, dtype=bool)
+        else:
+            mask = np.zeros(size, dtype=bool)
+            rows = [self._rows[_id] for _id in ids if _id in self._rows]
+            mask[rows] = True
+        for field, predicate in conditions.items():
+            mask &= self._columns[field].mask(predicate, size)
+        return mask
+
+    def filter_ids(self, ids: Iterable, conditions: Dict[str, Callable], limit: Optional[int] = None) -> list:
+        """The `ids` whose rows satisfy every condition, in their original order.
+
+        With `limit`, stops once that many are found.
+        """
+        mask = self.mask(conditions)
+        if limit is None:
+            # a list indexes much faster than an array when most ids are checked
+            mask = mask.tolist()
+        kept = []
+        for _id in ids:
+            row = self._rows.get(_id)
+            if row is not None and mask[row]:
+                kept.append(_id)
+                if len(kept) == limit:
+                    break
+        return kept
+
+    def value_counts(self, field: str, mask: np.ndarray, limit: int) -> List[dict]:
+        """Most frequent non-empty values of a category column among the masked rows."""
+        column: CategoryColumn = self._columns[field]
+        counts = np.bincount(column.data[:len(self._ids)][mask], minlength=len(column.values))
+        order = np.argsort(-counts, kind='stable')
+        return [
+            {'value': column.values[code], 'count': int(counts[code])}
+            for code in order
+            if counts[code] and column.values[code]
+        ][:limit]
+
+    def recency_counts(self, field: str, mask: np.ndarray, now: float) -> List[dict]:
+        """Masked rows whose time column falls within each of DATE_BUCKETS_DAYS."""
+        timestamps = self._columns[field].data[:len(self._ids)][mask]
+        return [
+            {'days': days, 'count': int(np.count_nonzero(timestamps >= now - days * 86400))}
+            for days in DATE_BUCKETS_DAYS
+        ]
@@ -0,0 +1,73 @@
+import hashlib
+import heapq
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.nlp.vector_index import VectorIndex
+
+
+@dataclass
+class _Entry:
+    index_id: int
+    epoch: int
+    watermark: int
+    query_digest: str
+    k: int
+    hits: List[Tuple[object, float]]
+
+
+class MatchCache:
+    """Per-candidate top-k job matches, kept current by scoring only new jobs.
+
+    Each entry remembers how many index rows had been scored (the watermark). While
+    the index epoch is unchanged, a later lookup scores just the rows appended since
+    then and merges them into the cached top-k. Deleting jobs bumps the epoch and a
+    changed candidate embedding changes the query digest; either forces a full rescore.
+    """
+
+    def __init__(self, maxsize: int, k: int):
+        self.k = k
+        self._entries = LRUCache(maxsize)
+        self.full_scores = 0
+        self.incremental_scores = 0
+
+    def top_k(self, index: VectorIndex, candidate_id, query: np.ndarray, k: int) -> List[Tuple[object, float]]:
+        digest = hashlib.sha1(np.ascontiguousarray(query, dtype=np.float32).tobytes()).hexdigest()
+        entry = self._entries.get(candidate_id)
+        if (
+            entry is not None
+            and entry.index_id == id(index)
+            and entry.epoch == index.epoch
+            and entry.query_digest == digest
+            and entry.k >= k
+        ):
+            if entry.watermark < len(index):
+                new_hits = index.search(query, entry.k, start=entry.watermark)
+                entry.hits = heapq.nlargest(entry.k, entry.hits + new_hits, key=lambda h: h[1])
+                entry.watermark = len(index)
+                self.incremental_scores += 1
+            return entry.hits[:k]
+
+        cache_k = max(k, self.k)
+        hits = index.search(query, cache_k)
+        self._entries.set(candidate_id, _Entry(id(index), index.epoch, len(index), digest, cache_k, hits))
+        self.full_scores += 1
+        return hits[:k]
+
+    def invalidate(self, candidate_ids):
+        for candidate_id in candidate_ids:
+            self._entries.pop(candidate_id)
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            'full_scores': self.full_scores,
+            'incremental_scores': self.incremental_scores,
+        }
+
+
+match_cache = MatchCache(settings.MATCH_CACHE_SIZE, settings.MATCH_CACHE_K)
@@ -0,0 +1,69 @@
+"""Compact storage format for embeddings in MongoDB.
+
+Embeddings are written as BSON Binary holding packed little-endian float32 (or
+float16) values instead of an array of doubles: 1.5KB (or 768B) rather than ~3.5KB
+for a 384-dim vector, and decoding is a zero-copy `np.frombuffer` instead of building
+384 Python floats. The dtype is carried in a user-defined Binary subtype.
+
+`decode_embedding` also accepts the legacy list format, so documents written before
+the migration (see `migrate_embeddings.py`) stay readable.
+"""
+from typing import Optional
+
+import numpy as np
+from bson.binary import Binary
+
+from app.core.config import settings
+
+FLOAT32_SUBTYPE = 0x80
+FLOAT16_SUBTYPE = 0x81
+
+_DTYPES = {
+    FLOAT32_SUBTYPE: np.dtype('<f4'),
+    FLOAT16_SUBTYPE: np.dtype('<f2'),
+}
+_SUBTYPES = {'float32': FLOAT32_SUBTYPE, 'float16': FLOAT16_SUBTYPE}
+
+
+def encode_embedding(vec, storage: Optional[str] = None):
+    """Convert an embedding to its stored form according to EMBEDDING_STORAGE_DTYPE.
+
+    "float32" / "float16" give packed Binary; "list" keeps the legacy array of doubles.
+    """
+    if vec is None:
+        return None
+    storage = storage or settings.EMBEDDING_STORAGE_DTYPE
+    if storage == 'list':
+        return np.asarray(vec, dtype=np.float64).tolist()
+    subtype = _SUBTYPES[storage]
+    return Binary(np.asarray(vec, dtype=_DTYPES[subtype]).tobytes(), subtype)
+
+
+def decode_embedding(value) -> Optional[np.ndarray]:
+    """Return a 1-D float array for a stored embedding in either format, or None.
+
+    float32 Binary is returned as a read-only view over the BSON bytes; float16 is
+    widened to float32.
+    """
+    if value is None:
+        return None
+    if isinstance(value, Binary):
+        dtype = _DTYPES.get(value.subtype)
+        if dtype is None:
+            return None
+        vec = np.frombuffer(value, dtype=dtype)
+        return vec if dtype == np.float32 else vec.astype(np.float32)
+    if isinstance(value, np.ndarray):
+        return value
+    if not len(value):
+        return None
+    return np.asarray(value, dtype=np.float32)
+
+
+def storage_format(value) -> Optional[str]:
+    """Name of the format a stored embedding is in ("list", "float32", "float16")."""
+    if isinstance(value, Binary):
+        return {v: k for k, v in _SUBTYPES.items()}.get(value.subtype)
+    if isinstance(value, list):
+        return 'list'
+    return None
@@ -0,0 +1,207 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.nlp.attribute_columns import COLUMN_TYPES
+from app.nlp.collection_index import CollectionIndex
+from app.nlp.vector_codec import decode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class VectorIndex(CollectionIndex):
+    """Process-local embedding index over one MongoDB collection.
+
+    Embeddings are kept as a contiguous, L2-normalized float32 matrix so cosine
+    similarity against every row is a single matrix-vector product. Loading and
+    catch-up are handled by `CollectionIndex`.
+
+    New rows are always appended, so rows `[n:]` are exactly those added since the
+    index had `n` rows. `epoch` changes whenever existing rows are removed, moved or
+    overwritten, which invalidates any such row-count watermark.
+
+    `attributes` maps document fields to a column kind (see `attribute_columns`);
+    their values are stored per row so searches can be restricted with `mask`.
+    """
+
+    query = {'embedding': {'$exists': True, '$ne': None}}
+
+    def __init__(self, collection: str, after_id=None, attributes: Optional[Dict[str, str]] = None):
+        super().__init__(collection, after_id)
+        self.attributes = attributes or {}
+        self.projection = {'embedding': 1, **{field: 1 for field in self.attributes}}
+        self._columns = {field: COLUMN_TYPES[kind]() for field, kind in self.attributes.items()}
+        self.dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.empty(0, dtype=object)
+        self._rows = {}
+        self._size = 0
+        self.epoch = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, _id) -> bool:
+        return _id in self._rows
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[:self._size]
+
+    def add_documents(self, docs: Iterable[dict]) -> int:
+        """Add or replace rows for documents that carry an `_id` and an `embedding`.
+
+        A document without an embedding only updates the attributes of its existing row.
+        """
+        ids, vectors, attrs = [], [], []
+        for doc in docs:
+            vec = decode_embedding(doc.get('embedding'))
+            if doc.get('_id') is None:
+                continue
+            if vec is not None:
+                ids.append(doc['_id'])
+                vectors.append(vec)
+                attrs.append(doc)
+            elif doc['_id'] in self._rows:
+                # no new vector: keep the row, but refresh its attribute columns
+                self._set_attributes(self._rows[doc['_id']], doc)
+        if not ids:
+            return 0
+        return self.add(ids, vectors, attrs)
+
+    def add(self, ids: List, vectors, attrs: Optional[List[dict]] = None) -> int:
+        """Insert or overwrite rows. Returns the number of rows appended.
+
+        `attrs` holds one mapping per row with the values of the attribute columns.
+        """
+        if not len(ids):
+            return 0
+        if self.dim is None:
+            self.dim = len(vectors[0])
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        keep = [i for i, v in enumerate(vectors) if v is not None and len(v) == self.dim]
+        if len(keep) < len(ids):
+            logger.warning(
+                f"Skipping {len(ids) - len(keep)} {self.collection} embeddings "
+                f"not matching index dim {self.dim}"
+            )
+            if not keep:
+                return 0
+            ids = [ids[i] for i in keep]
+            vectors = [vectors[i] for i in keep]
+            if attrs is not None:
+                attrs = [attrs[i] for i in keep]
+        mat = np.asarray(vectors, dtype=np.float32)
+        mat = _normalize_rows(mat)
+
+        new_rows = []
+        for i, _id in enumerate(ids):
+            row = self._rows.get(_id)
+            if row is None:
+                new_rows.append(i)
+                continue
+            if not np.array_equal(self._matrix[row], mat[i]):
+                self._matrix[row] = mat[i]
+                self.epoch += 1
+            if attrs is not None:
+                self._set_attributes(row, attrs[i])
+        if not new_rows:
+            return 0
+
+        self._reserve(self._size + len(new_rows))
+        start, end = self._size, self._size + len(new_rows)
+        self._matrix[start:end] = mat[new_rows]
+        for offset, i in enumerate(new_rows):
+            self._ids[start + offset] = ids[i]
+            self._rows[ids[i]] = start + offset
+            self._set_attributes(start + offset, attrs[i] if attrs is not None else {})
+        self._size = end
+        return len(new_rows)
+
+    def _set_attributes(self, row: int, values: dict):
+        for field, column in self._columns.items():
+            column.set(row, values.get(field))
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._matrix):
+            return
+        new_cap = max(capacity, 2 * len(self._matrix), 1024)
+        matrix = np.zeros((new_cap, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.empty(new_cap, dtype=object)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+        for column in self._columns.values():
+            column.resize(new_cap, self._size)
+
+    def remove(self, ids: Iterable) -> int:
+        """Drop rows by id, moving the last row into each freed slot."""
+        removed = 0
+        for _id in ids:
+            row = self._rows.pop(_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                moved = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+                for column in self._columns.values():
+                    column.move(last, row)
+            self._ids[last] = None
+            self._size = last
+            removed += 1
+        if removed:
+            self.epoch += 1
+        return removed
+
+    def mask(self, conditions: Dict[str, Callable]) -> np.ndarray:
+        """Boolean row mask of rows satisfying every condition.
+
+        Conditions map an attribute to a predicate: called once per distinct value for
+        category columns, and on the whole value array for time columns.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for field, predicate in conditions.items():
+            mask &= self._columns[field].mask(predicate, self._size)
+        return mask
+
+    def search(self, query, k: int, start: int = 0, mask: Optional[np.ndarray] = None) -> List[Tuple[object, float]]:
+        """Return up to `k` (id, cosine similarity) pairs, best first.
+
+        With `start`, only rows from that position on are scored (see `epoch`). With
+        `mask` (from `mask()`), only rows where it is true are scored.
+        """
+        if self._size - start <= 0 or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (self.dim,):
+            return []
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return []
+        if mask is None:
+            rows = np.arange(start, self._size)
+            scores = self._matrix[start:self._size] @ (q / norm)
+        else:
+            rows = np.flatnonzero(mask[start:self._size]) + start
+            scores = self._matrix[rows] @ (q / norm)
+        n = len(rows)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Header
 from app.core.config import settings
 from app.db import get_collection
+from app.indexes import on_candidates_changed
+from app.nlp.vector_codec import encode_embedding
 import logging
 from typing import Optional
 
@@ -29,7 +31,7 @@ async def reembed_candidates(limit: int = 100, batch_size: int = 10, x_admin_key
 
     # Try to import the embedding function lazily
     try:
-        from app.nlp.embeddings import embed_text
+        from app.nlp.batcher import embed_texts_async
     except Exception as e:
         logger.exception('Embedding module unavailable')
         raise HTTPException(status_code=500, detail=f'Embedding unavailable: {e}')
@@ -37,6 +39,20 @@ async def reembed_candidates(limit: int = 100, batch_size: int = 10, x_admin_key
     updated = 0
     errors = []
 
+    async def _embed_batch(batch):
+        nonlocal updated
+        try:
+            embs = await embed_texts_async([text for _, text in batch])
+        except Exception as e:
+            logger.exception(f'Failed to embed batch of {len(batch)} candidates: {e}')
+            errors.extend({'id': str(cid), 'error': str(e)} for cid, _ in batch)
+            return
+        for (cid, _), emb in zip(batch, embs):
+            await candidates.update_one({'_id': cid}, {'$set': {'embedding': encode_embedding(emb)}})
+            updated += 1
+        await on_candidates_changed({'_id': cid, 'embedding': emb} for (cid, _), emb in zip(batch, embs))
+
+    batch = []
     cursor = candidates.find({'$or': [{'embedding': {'$exists': False}}, {'embedding': None}]}, limit=limit)
     async for doc in cursor:
         cid = doc.get('_id')
@@ -44,12 +60,52 @@ async def reembed_candidates(limit: int = 100, batch_size: int = 10, x_admin_key
         if not text or len(text.strip()) < 20:
             errors.append({'id': str(cid), 'error': 'no or too short text'})
             continue
-        try:
-            emb = embed_text(text)
-            await candidates.update_one({'_id': cid}, {'$set': {'embedding': emb}})
-            updated += 1
-        except Exception as e:
-            logger.exception(f'Failed to embed candidate {cid}: {e}')
-            errors.append({'id': str(cid), 'error': str(e)})
+        batch.append((cid, text))
+        if len(batch) >= batch_size:
+            await _embed_batch(batch)
+            batch = []
+    if batch:
+        await _embed_batch(batch)
 
     return {'updated': updated, 'errors': errors}
+
+
+@router.get('/embeddings/cache')
+async def embedding_cache_stats(x_admin_key: Optional[str] = Header(None)):
+    """Hit / miss counters for the embedding cache and the search query cache. Requires X-ADMIN-KEY."""
+    if not _check_admin_key(x_admin_key):
+        raise HTTPException(status_code=401, detail='Missing or invalid admin key')
+
+    from app.nlp.batcher import query_cache
+    from app.nlp.embedding_cache import embedding_cache
+    return {**embedding_cache.stats(), 'query_cache': query_cache.stats()}
+
+
+@router.get('/matches/cache')
+async def match_cache_stats(x_admin_key: Optional[str] = Header(None)):
+    """Size and full / incremental rescore counters of the per-candidate match cache. Requires X-ADMIN-KEY."""
+    if not _check_admin_key(x_admin_key):
+        raise HTTPException(status_code=401, detail='Missing or invalid admin key')
+
+    from app.nlp.match_cache import match_cache
+    return match_cache.stats()
+
+
+@router.get('/responses/cache')
+async def response_cache_stats(x_admin_key: Optional[str] = Header(None)):
+    """Backend, hit rate and invalidations of the job listing / search response cache. Requires X-ADMIN-KEY."""
+    if not _check_admin_key(x_admin_key):
+        raise HTTPException(status_code=401, detail='Missing or invalid admin key')
+
+    from app.core.response_cache import job_response_cache
+    return job_response_cache.stats()
+
+
+@router.get('/model')
+async def embedding_model_status(x_admin_key: Optional[str] = Header(None)):
+    """Embedding model load time and this worker's memory (RSS / PSS). Requires X-ADMIN-KEY."""
+    if not _check_admin_key(x_admin_key):
+        raise HTTPException(status_code=401, detail='Missing or invalid admin key')
+
+    from app.nlp.embeddings import model_status
+    return model_status()
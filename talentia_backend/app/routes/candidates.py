@@ -1,9 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from app.db import get_collection
+from app.indexes import get_candidate_index, on_candidates_changed, on_candidates_deleted
 import os
 from tempfile import NamedTemporaryFile
-from app.utils.text_extraction import extract_text
-from app.nlp.embeddings import embed_text
+from app.utils.text_extraction import extract_text_async
+from app.nlp.batcher import embed_text_async
+from app.nlp.vector_codec import decode_embedding, encode_embedding
 from datetime import datetime
 from bson.objectid import ObjectId
 import logging
@@ -64,7 +66,7 @@ async def upload_cv(file: UploadFile = File(...)):
     try:
         # Extract text
         try:
-            text = extract_text(tmp_path)
+            text = await extract_text_async(tmp_path)
             logger.info(f"Extracted {len(text)} characters from {file.filename}")
         except Exception as e:
             logger.exception(f"Failed to extract text from {file.filename}")
@@ -109,7 +111,7 @@ async def upload_cv(file: UploadFile = File(...)):
         emb = None
         emb_error = None
         try:
-            emb = embed_text(text)
+            emb = await embed_text_async(text)
             logger.info(f"Generated embedding for {file.filename}")
         except RuntimeError as re:
             logger.warning(f"Embedding generation unavailable: {re}")
@@ -122,11 +124,12 @@ async def upload_cv(file: UploadFile = File(...)):
         candidates = get_collection("candidates")
         doc = {
             "full_text": text,
-            "embedding": emb,
+            "embedding": encode_embedding(emb),
             "filename": file.filename,
             "created_at": datetime.utcnow(),
         }
         res = await candidates.insert_one(doc)
+        await on_candidates_changed([doc])
         
         candidate_id = str(res.inserted_id)
         logger.info(f"Candidate created id={candidate_id}")
@@ -167,4 +170,63 @@ async def upload_cv(file: UploadFile = File(...)):
 async def get_recent_uploads():
     """Return recent upload events (dev/debug). Not for production."""
     # return a shallow copy to avoid accidental mutation
-    return RECENT_UPLOADS[:]
\ No newline at end of file
+    return RECENT_UPLOADS[:]
+
+
+@router.get('/match/{job_id}')
+async def match_candidates(
+    job_id: str,
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Rank candidates for a job by embedding similarity (reverse of /jobs/match)"""
+    jobs_col = get_collection('jobs')
+    candidates_col = get_collection('candidates')
+
+    try:
+        job = await jobs_col.find_one({'_id': ObjectId(job_id)}, {'embedding': 1})
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job_emb = decode_embedding(job.get('embedding'))
+    if job_emb is None:
+        raise HTTPException(status_code=400, detail="Job has no embedding")
+
+    # Score every candidate in one pass over the in-memory index
+    index = await get_candidate_index()
+    hits = index.search(job_emb, limit)
+
+    docs = {}
+    cursor = candidates_col.find(
+        {'_id': {'$in': [cid for cid, _ in hits]}},
+        {'full_text': 1, 'filename': 1, 'created_at': 1}
+    )
+    async for doc in cursor:
+        docs[doc['_id']] = doc
+
+    # Drop rows whose candidate was deleted by another process
+    missing = [cid for cid, _ in hits if cid not in docs]
+    if missing:
+        await on_candidates_deleted(missing)
+
+    matches = []
+    for cid, similarity in hits:
+        doc = docs.get(cid)
+        if not doc:
+            continue
+        text = doc.get('full_text') or ''
+        matches.append({
+            'id': str(cid),
+            'filename': doc.get('filename'),
+            'created_at': doc.get('created_at'),
+            'snippet': text[:300],
+            'similarity': similarity,
+        })
+
+    return {
+        'job_id': job_id,
+        'matches': matches,
+        'total_candidates': len(index)
+    }
@@ -1,104 +1,300 @@
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.response_cache import cached_response, job_response_cache
 from app.db import get_collection
-from app.nlp.embeddings import cosine_sim
+from app.filters import JobFilters
+from app.indexes import (
+    get_facet_index, get_job_index, get_keyword_index, get_match_index, get_prefix_index, job_count_cache,
+    on_jobs_deleted
+)
+from app.nlp.batch_match import stream_batch_matches
+from app.nlp.batcher import embed_query_async
+from app.nlp.bm25 import reciprocal_rank_fusion
+from app.nlp.match_cache import match_cache
+from app.nlp.vector_index import VectorIndex
+from app.nlp.vector_codec import decode_embedding
+from app.schemas import BatchMatchRequest
+from app.scrape_scheduler import scrape_scheduler
 from bson.objectid import ObjectId
+import base64
+import json
 import logging
-from typing import Optional
-
-# Fixed import path
-from scrapers import api_scraper
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-async def _background_scrape(query: str, location: str, limit: int):
-    """Background task to scrape jobs"""
+# Fields returned by the listing endpoints; the embedding is never sent
+JOB_FIELDS = (
+    'title', 'company', 'location', 'description', 'url', 'type', 'salary',
+    'experience', 'scraped_at', 'posted_date', 'source',
+)
+
+
+def _selected_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma-separated `fields` parameter (default: every field in JOB_FIELDS)."""
+    if not fields:
+        return JOB_FIELDS
+    selected = tuple(f.strip() for f in fields.split(',') if f.strip())
+    unknown = [f for f in selected if f not in JOB_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(JOB_FIELDS)}"
+        )
+    return selected
+
+
+def _job_projection(selected: Tuple[str, ...], snippet: Optional[int] = None, extra=()) -> dict:
+    """Mongo projection for `selected` (plus internal `extra` fields).
+
+    With `snippet`, the description is cut to that many characters by the server
+    ($substrCP, MongoDB 4.4+), so full descriptions never cross the wire.
+    """
+    projection = {field: 1 for field in (*selected, *extra)}
+    if snippet and 'description' in projection:
+        projection['description'] = {'$substrCP': [{'$ifNull': ['$description', '']}, 0, snippet]}
+    return projection
+
+
+def _job_out(doc: dict, selected: Tuple[str, ...]) -> dict:
+    job = {'id': str(doc['_id'])}
+    for field in selected:
+        job[field] = doc.get(field)
+    return job
+
+
+async def _rank_jobs(query: str, mode: str = 'keyword') -> List[ObjectId]:
+    """Job ids ranked for a free-text query, best first.
+
+    `keyword` returns every BM25 match; `hybrid` fuses the top BM25 and embedding
+    hits with reciprocal rank fusion.
+    """
+    keyword_index = await get_keyword_index()
+    if mode == 'hybrid':
+        try:
+            query_emb = await embed_query_async(query)
+        except RuntimeError as e:
+            logger.warning(f"Hybrid search falling back to keyword ranking: {e}")
+        else:
+            index = await get_match_index()
+            n = settings.SEARCH_VECTOR_CANDIDATES
+            fused = reciprocal_rank_fusion(
+                keyword_index.search(query, n), index.search(query_emb, n), k=settings.SEARCH_RRF_K
+            )
+            return [job_id for job_id, _ in fused]
+    return [job_id for job_id, _ in keyword_index.search(query)]
+
+
+async def _semantic_search(query: str, conditions: dict, limit: int) -> List[ObjectId]:
+    """Up to `limit` job ids matching `conditions`, ranked by similarity to the query embedding.
+
+    The nearest SEARCH_VECTOR_CANDIDATES jobs are filtered on the in-memory attribute
+    columns; when the filters leave fewer than `limit`, the candidate window doubles
+    until the index is exhausted.
+    """
     try:
-        logger.info(f"Starting background scrape: query={query}, location={location}")
-        jobs = api_scraper.scrape_jobs_with_api(query, location, limit)
+        query_emb = await embed_query_async(query)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=f"Semantic search unavailable: {e}")
+    index = await get_match_index()
+    n = max(settings.SEARCH_VECTOR_CANDIDATES, limit)
+    while True:
+        hits = index.search(query_emb, n)
+        ranked = await _filter_ranked([job_id for job_id, _ in hits], conditions, limit)
+        if len(ranked) >= limit or len(hits) < n:
+            return ranked[:limit]
+        n *= 2
+
+
+async def _filter_ranked(ids: List[ObjectId], conditions: dict, limit: Optional[int] = None) -> List[ObjectId]:
+    """Keep the ranked ids matching `conditions` (see `JobFilters.index_conditions`), in rank order.
+
+    Evaluated on the facet index's attribute columns, without a MongoDB round trip;
+    with `limit`, only the first `limit` matches are returned.
+    """
+    if not conditions:
+        return list(ids[:limit] if limit else ids)
+    index = await get_facet_index()
+    return index.filter_ids(ids, conditions, limit)
+
+
+async def _fetch_ranked(jobs_col, ids: List[ObjectId], projection: Optional[dict] = None) -> List[dict]:
+    """Fetch documents by id, returned in the order of `ids`."""
+    docs = {}
+    async for doc in jobs_col.find({'_id': {'$in': ids}}, projection):
+        docs[doc['_id']] = doc
+    return [docs[job_id] for job_id in ids if job_id in docs]
 
-        if not jobs:
-            logger.warning("No jobs scraped")
-            return
 
-        # Insert jobs into database
-        jobs_col = get_collection('jobs')
-        for j in jobs:
-            if '_id' in j:
-                del j['_id']
+async def _materialized_matches(candidate_id: ObjectId, limit: int) -> Optional[Tuple[list, int]]:
+    """Precomputed (hits, job_count) for a candidate from `materialize_matches.py`.
 
-        res = await jobs_col.insert_many(jobs)
-        logger.info(f"Background scrape complete: {len(res.inserted_ids)} jobs inserted")
-    except Exception as e:
-        logger.error(f"Background scraping failed: {e}", exc_info=True)
+    Returns None when there is no entry, it is older than
+    MATERIALIZED_MATCHES_MAX_AGE_HOURS, or it holds fewer than `limit` matches.
+    """
+    doc = await get_collection('matches').find_one({'_id': candidate_id})
+    if not doc or doc.get('k', 0) < limit:
+        return None
+    max_age = timedelta(hours=settings.MATERIALIZED_MATCHES_MAX_AGE_HOURS)
+    if datetime.utcnow() - doc['computed_at'] > max_age:
+        return None
+    hits = [(m['job_id'], m['similarity']) for m in doc['matches'][:limit]]
+    return hits, doc.get('job_count', len(hits))
+
+
+_LISTING_SORT = [('scraped_at', -1), ('_id', -1)]
+
+
+def _encode_cursor(position: dict) -> str:
+    """Opaque continuation token for a listing position."""
+    raw = json.dumps(position, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(token: str, key: str) -> dict:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        if key not in position:
+            raise ValueError(f"cursor has no {key!r}")
+        if key == 'o':
+            position['o'] = max(0, int(position['o']))
+        else:
+            position['i'] = ObjectId(position['i'])
+            if position.get('s') is not None:
+                position['s'] = datetime.fromisoformat(position['s'])
+        return position
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_of(doc: dict) -> dict:
+    scraped_at = doc.get('scraped_at')
+    return {
+        's': scraped_at.isoformat() if isinstance(scraped_at, datetime) else None,
+        'i': str(doc['_id']),
+    }
+
+
+def _after_keyset(position: dict) -> dict:
+    """Jobs that sort after `position` in (scraped_at desc, _id desc) order.
+
+    Jobs without scraped_at sort last, after every dated one.
+    """
+    scraped_at, last_id = position.get('s'), position['i']
+    if scraped_at is None:
+        return {'scraped_at': None, '_id': {'$lt': last_id}}
+    return {'$or': [
+        {'scraped_at': {'$lt': scraped_at}},
+        {'scraped_at': scraped_at, '_id': {'$lt': last_id}},
+        {'scraped_at': None},
+    ]}
+
+
+async def _count_jobs(filter_query: dict, key: tuple) -> int:
+    """Exact count for a filter set, cached for JOB_COUNT_CACHE_SECONDS (and until the next ingest)."""
+    total = job_count_cache.get(key)
+    if total is None:
+        total = await get_collection('jobs').count_documents(filter_query)
+        job_count_cache.set(key, total)
+    return total
 
 
 @router.post('/scrape')
 async def trigger_scrape(
-    background_tasks: BackgroundTasks,
     query: str = Query(..., description="Job search query"),
     location: str = Query("", description="Location filter"),
     limit: int = Query(30, description="Max jobs to scrape")
 ):
-    """Trigger job scraping in background"""
-    background_tasks.add_task(_background_scrape, query, location, limit)
+    """Request a scrape; identical in-flight or recently refreshed queries are not re-run"""
+    outcome = await scrape_scheduler.request(query, location, limit)
+    if outcome == 'started':
+        return {
+            "status": "scraping_started",
+            "message": f"Scraping jobs for '{query}' in background"
+        }
+    if outcome in ('running', 'leased'):
+        return {
+            "status": "scraping_in_progress",
+            "message": f"A scrape for '{query}' is already running"
+        }
     return {
-        "status": "scraping_started",
-        "message": f"Scraping jobs for '{query}' in background"
+        "status": "recently_scraped",
+        "message": f"Jobs for '{query}' were refreshed less than {settings.SCRAPE_MIN_REFRESH_MINUTES} minutes ago"
     }
 
 
+@router.get('/scrape/status')
+async def scrape_status():
+    """Scheduler state: in-flight queries, counters and the latest run per query"""
+    return await scrape_scheduler.status()
+
+
 @router.get('/all')
+@cached_response(job_response_cache)
 async def get_all_jobs(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     q: str = Query(None, description="Search query"),
     location: str = Query(None, description="Location filter"),
-    contract: str = Query(None, description="Contract type filter (CDI, CDD, Stage, etc.)")
+    contract: str = Query(None, description="Contract type filter (CDI, CDD, Stage, etc.)"),
+    source: str = Query(None, description="Source filter (jsearch_api, linkedin, indeed, mock)"),
+    days: int = Query(None, ge=1, description="Only jobs scraped in the last N days"),
+    posted_days: int = Query(None, ge=1, description="Only jobs posted in the last N days"),
+    cursor: str = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(True, description="Return the total (cached per filter set)"),
+    fields: str = Query(None, description="Comma-separated fields to return (default: all summary fields)"),
+    snippet: int = Query(None, ge=20, le=5000, description="Truncate descriptions to this many characters")
 ):
-    """Get all jobs with pagination and optional filters"""
+    """Get all jobs with pagination and optional filters.
+
+    Pages can be addressed by `page` or, at constant cost however deep, by passing
+    back `next_cursor`. Without a query jobs are listed newest first.
+    """
     jobs_col = get_collection('jobs')
+    selected = _selected_fields(fields)
 
     # Build filter
-    filter_query = {}
-    if location:
-        filter_query['location'] = {'$regex': location, '$options': 'i'}
-    if contract:
-        filter_query['type'] = {'$regex': contract, '$options': 'i'}
-
-    # If there's a text query, search in title, description, company
-    if q:
-        filter_query['$or'] = [
-            {'title': {'$regex': q, '$options': 'i'}},
-            {'description': {'$regex': q, '$options': 'i'}},
-            {'company': {'$regex': q, '$options': 'i'}}
-        ]
-
-    # Get total count
-    total = await jobs_col.count_documents(filter_query)
+    filters = JobFilters(location, contract, source, days, posted_days)
+    filter_query = filters.mongo_query()
 
     # Calculate skip
     skip = (page - 1) * page_size
+    next_cursor = None
 
-    # Get paginated results
-    cursor = jobs_col.find(filter_query).skip(skip).limit(page_size)
-    jobs = []
-    async for doc in cursor:
-        jobs.append({
-            'id': str(doc['_id']),
-            'title': doc.get('title'),
-            'company': doc.get('company'),
-            'location': doc.get('location'),
-            'description': doc.get('description'),
-            'url': doc.get('url'),
-            'type': doc.get('type'),
-            'salary': doc.get('salary'),
-            'experience': doc.get('experience'),
-            'scraped_at': doc.get('scraped_at'),
-            'posted_date': doc.get('posted_date'),
-            'source': doc.get('source')
-        })
+    if q:
+        # Text queries are ranked by the in-memory BM25 index over title, company
+        # and description, and filtered on the in-memory attribute columns
+        if cursor:
+            skip = _decode_cursor(cursor, 'o')['o']
+        ranked = await _filter_ranked(await _rank_jobs(q), filters.index_conditions())
+        total = len(ranked)
+        docs = await _fetch_ranked(jobs_col, ranked[skip:skip + page_size], _job_projection(selected, snippet))
+        if skip + page_size < total:
+            next_cursor = _encode_cursor({'o': skip + page_size})
+    else:
+        # Keyset pagination on (scraped_at, _id): a cursor resumes right after the
+        # last job of the previous page instead of skipping over every earlier one
+        # scraped_at is always read: the next cursor is built from it
+        projection = _job_projection(selected, snippet, extra=('scraped_at',))
+        if cursor:
+            after = _after_keyset(_decode_cursor(cursor, 'i'))
+            query = {'$and': [filter_query, after]} if filter_query else after
+            listing = jobs_col.find(query, projection).sort(_LISTING_SORT)
+        else:
+            listing = jobs_col.find(filter_query, projection).sort(_LISTING_SORT).skip(skip)
+        docs = await listing.limit(page_size + 1).to_list(page_size + 1)
+        if len(docs) > page_size:
+            docs = docs[:page_size]
+            next_cursor = _encode_cursor(_keyset_of(docs[-1]))
+
+        filter_key = (location, contract, source, days, posted_days)
+        total = await _count_jobs(filter_query, filter_key) if include_total else None
+
+    jobs = [_job_out(doc, selected) for doc in docs]
 
     return {
         'jobs': jobs,
@@ -106,18 +302,24 @@ async def get_all_jobs(
         'total': total,
         'page': page,
         'page_size': page_size,
-        'total_pages': (total + page_size - 1) // page_size
+        'total_pages': (total + page_size - 1) // page_size if total is not None else None,
+        'next_cursor': next_cursor
     }
 
 
 @router.get('/search')
+@cached_response(job_response_cache)
 async def search_jobs(
     query: str = Query(None, description="Search query"),
     location: str = Query(None, description="Location filter"),
     job_type: str = Query(None, description="Job type filter (CDI, CDD, Stage, etc.)"),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    mode: str = Query('keyword', regex='^(keyword|semantic|hybrid)$',
+                      description="keyword (BM25), semantic (embedding similarity) or hybrid (both fused)"),
+    fields: str = Query(None, description="Comma-separated fields to return (default: all summary fields)"),
+    snippet: int = Query(None, ge=20, le=5000, description="Truncate descriptions to this many characters")
 ):
-    """Search jobs with filters"""
+    """Search jobs with filters, ranked by relevance when a query is given"""
     jobs_col = get_collection('jobs')
 
     # Build filter
@@ -127,43 +329,109 @@ async def search_jobs(
     if job_type:
         filter_query['type'] = job_type
 
-    # If there's a text query, we could do a simple text search
-    if query:
-        filter_query['$or'] = [
-            {'title': {'$regex': query, '$options': 'i'}},
-            {'description': {'$regex': query, '$options': 'i'}},
-            {'company': {'$regex': query, '$options': 'i'}}
-        ]
-
-    cursor = jobs_col.find(filter_query).limit(limit)
-    jobs = []
-    async for doc in cursor:
-        jobs.append({
-            'id': str(doc['_id']),
-            'title': doc.get('title'),
-            'company': doc.get('company'),
-            'location': doc.get('location'),
-            'description': doc.get('description'),
-            'url': doc.get('url'),
-            'type': doc.get('type'),
-            'salary': doc.get('salary'),
-            'experience': doc.get('experience'),
-            'scraped_at': doc.get('scraped_at'),
-            'posted_date': doc.get('posted_date'),
-            'source': doc.get('source')
-        })
+    # the same filters for ranked results, on the in-memory attribute columns
+    conditions = JobFilters(location=location).index_conditions()
+    if job_type:
+        conditions['type'] = lambda value: value == job_type
+
+    selected = _selected_fields(fields)
+    projection = _job_projection(selected, snippet)
+    if query and mode == 'semantic':
+        ranked = await _semantic_search(query, conditions, limit)
+        docs = await _fetch_ranked(jobs_col, ranked, projection)
+    elif query:
+        ranked = await _filter_ranked(await _rank_jobs(query, mode), conditions, limit)
+        docs = await _fetch_ranked(jobs_col, ranked, projection)
+    else:
+        docs = await jobs_col.find(filter_query, projection).limit(limit).to_list(limit)
+
+    jobs = [_job_out(doc, selected) for doc in docs]
 
     return {'jobs': jobs, 'count': len(jobs)}
 
 
+@router.get('/autocomplete')
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    kind: str = Query(None, regex='^(title|company|skill)$', description="Restrict to one kind of suggestion")
+):
+    """Type-ahead suggestions from job titles, companies and skills, most used first"""
+    index = await get_prefix_index()
+    return {'query': q, 'suggestions': index.suggest(q, limit, kind)}
+
+
+# facet name -> attribute column it counts (and whose own filter it ignores)
+_FACET_FIELDS = {'location': 'location', 'type': 'type', 'source': 'source', 'posted': 'posted_date'}
+
+
+@router.get('/facets')
+@cached_response(job_response_cache)
+async def job_facets(
+    q: str = Query(None, description="Search query"),
+    location: str = Query(None, description="Location filter"),
+    contract: str = Query(None, description="Contract type filter (CDI, CDD, Stage, etc.)"),
+    source: str = Query(None, description="Source filter (jsearch_api, linkedin, indeed, mock)"),
+    days: int = Query(None, ge=1, description="Only jobs scraped in the last N days"),
+    posted_days: int = Query(None, ge=1, description="Only jobs posted in the last N days"),
+    limit: int = Query(20, ge=1, le=200, description="Values returned per facet")
+):
+    """Job counts per location, contract type, source and posted-date bucket.
+
+    Counts come from in-memory attribute columns. Each facet honors every active
+    filter except its own, so the counts show what selecting another value of that
+    facet would return.
+    """
+    index = await get_facet_index()
+    conditions = JobFilters(location, contract, source, days, posted_days).index_conditions()
+    ids = await _rank_jobs(q) if q else None
+    now = datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
+
+    facets = {}
+    for name, field in _FACET_FIELDS.items():
+        others = {f: c for f, c in conditions.items() if f != field}
+        mask = index.mask(others, ids)
+        if name == 'posted':
+            facets[name] = index.recency_counts(field, mask, now)
+        else:
+            facets[name] = index.value_counts(field, mask, limit)
+
+    return {
+        'total': int(index.mask(conditions, ids).sum()),
+        'facets': facets
+    }
+
+
+@router.post('/match/batch')
+async def match_jobs_batch(request: BatchMatchRequest):
+    """Top-k jobs for many candidates, streamed as newline-delimited JSON.
+
+    Candidates are scored in blocks with one matrix product per block; each line is
+    sent as soon as its block finishes, in request order.
+    """
+    async def lines():
+        async for result in stream_batch_matches(request.candidate_ids, request.k):
+            yield json.dumps(result) + '\n'
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+
 @router.get('/match/{candidate_id}')
 async def match_jobs(
     candidate_id: str,
-    limit: int = Query(10, ge=1, le=50)
+    limit: int = Query(10, ge=1, le=50),
+    location: str = Query(None, description="Location filter"),
+    contract: str = Query(None, description="Contract type filter (CDI, CDD, Stage, etc.)"),
+    source: str = Query(None, description="Source filter (jsearch_api, linkedin, indeed, mock)"),
+    days: int = Query(None, ge=1, description="Only jobs scraped in the last N days"),
+    posted_days: int = Query(None, ge=1, description="Only jobs posted in the last N days"),
+    fields: str = Query(None, description="Comma-separated fields to return (default: all summary fields)"),
+    snippet: int = Query(None, ge=20, le=5000, description="Truncate descriptions to this many characters")
 ):
     """Find matching jobs for a candidate based on embedding similarity"""
     candidates_col = get_collection('candidates')
     jobs_col = get_collection('jobs')
+    selected = _selected_fields(fields)
     
     # Get candidate
     try:
@@ -174,44 +442,57 @@ async def match_jobs(
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    candidate_emb = candidate.get('embedding')
-    if not candidate_emb:
+    candidate_emb = decode_embedding(candidate.get('embedding'))
+    if candidate_emb is None:
         raise HTTPException(
             status_code=400, 
             detail="Candidate has no embedding. Please re-upload CV."
         )
     
-    # Get all jobs with embeddings
-    cursor = jobs_col.find({'embedding': {'$exists': True, '$ne': None}})
-    matches = []
-    
+    filters = JobFilters(location, contract, source, days, posted_days)
+    materialized = None if filters else await _materialized_matches(candidate['_id'], limit)
+    if filters:
+        # Filters are evaluated on the attribute columns of the exact index and only
+        # the eligible rows are scored
+        index = await get_job_index()
+        eligible = index.mask(filters.index_conditions())
+        hits = index.search(candidate_emb, limit, mask=eligible)
+        total = int(eligible.sum())
+    elif materialized is not None:
+        # Served from the nightly precomputed matches while they are fresh
+        hits, total = materialized
+    else:
+        # Score the whole corpus in one pass over the in-memory index; with the exact
+        # index, repeat calls only score jobs added since the candidate's last match
+        index = await get_match_index()
+        if isinstance(index, VectorIndex):
+            hits = match_cache.top_k(index, candidate['_id'], candidate_emb, limit)
+        else:
+            hits = index.search(candidate_emb, limit)
+        total = len(index)
+
+    # Only the top-k documents are fetched back from Mongo
+    docs = {}
+    cursor = jobs_col.find({'_id': {'$in': [job_id for job_id, _ in hits]}}, _job_projection(selected, snippet))
     async for job in cursor:
-        job_emb = job.get('embedding')
-        if job_emb:
-            similarity = cosine_sim(candidate_emb, job_emb)
-            matches.append({
-                'id': str(job['_id']),
-                'title': job.get('title'),
-                'company': job.get('company'),
-                'location': job.get('location'),
-                'description': job.get('description'),
-                'url': job.get('url'),
-                'type': job.get('type'),
-                'salary': job.get('salary'),
-                'experience': job.get('experience'),
-                'similarity': similarity,
-                'scraped_at': job.get('scraped_at'),
-                'posted_date': job.get('posted_date'),
-                'source': job.get('source')
-            })
-    
-    # Sort by similarity
-    matches.sort(key=lambda x: x['similarity'], reverse=True)
-    
+        docs[job['_id']] = job
+
+    # Drop rows whose job was deleted by another process
+    missing = [job_id for job_id, _ in hits if job_id not in docs]
+    if missing:
+        await on_jobs_deleted(missing)
+
+    matches = []
+    for job_id, similarity in hits:
+        job = docs.get(job_id)
+        if not job:
+            continue
+        matches.append({**_job_out(job, selected), 'similarity': similarity})
+
     return {
         'candidate_id': candidate_id,
-        'matches': matches[:limit],
-        'total_matches': len(matches)
+        'matches': matches,
+        'total_matches': total
     }
 
 
@@ -221,7 +502,7 @@ async def get_job(job_id: str):
     jobs_col = get_collection('jobs')
     
     try:
-        job = await jobs_col.find_one({'_id': ObjectId(job_id)})
+        job = await jobs_col.find_one({'_id': ObjectId(job_id)}, {'embedding': 0})
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid job ID")
     
@@ -37,3 +37,8 @@ class Job(BaseModel):
     url: Optional[str]
     embedding: Optional[List[float]]
     scraped_at: Optional[datetime]
+
+
+class BatchMatchRequest(BaseModel):
+    candidate_ids: List[str] = Field(..., min_items=1, max_items=10000)
+    k: int = Field(10, ge=1, le=100)
@@ -0,0 +1,220 @@
+"""Single-flight job scraping on a periodic timer.
+
+Every scrape is keyed by its normalized (query, location). A key runs at most
+once at a time and at most once per SCRAPE_MIN_REFRESH_MINUTES, across all
+workers: a run first takes a lease on the key's document in the `scrape_runs`
+collection with one atomic upsert, which fails while another run holds the
+lease or the last run finished too recently. Within a process, requests for a
+key that is already running are coalesced onto the running task.
+
+The timer requests SCRAPE_QUERIES every SCRAPE_INTERVAL_MINUTES; `/jobs/scrape`
+goes through the same path.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.db import get_collection
+from app.ingest import IngestResult
+from app.ingest_pipeline import IngestPipeline, ingest_jsearch
+
+logger = logging.getLogger(__name__)
+
+
+async def scrape_and_store(queries: List[str], location: str, limit: int,
+                           pipeline: Optional[IngestPipeline] = None) -> IngestResult:
+    """Stream jobs for `queries` through the ingest pipeline (see `app.ingest_pipeline`)."""
+    pipeline = pipeline or IngestPipeline()
+    result = await ingest_jsearch(pipeline, queries, location, limit)
+    logger.info(f"Scrape complete for {queries}: {result.as_dict()}")
+    return result
+
+
+def scrape_key(query: str, location: str) -> str:
+    return f"{' '.join(query.lower().split())}|{' '.join((location or '').lower().split())}"
+
+
+class ScrapeScheduler:
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._pipelines: Dict[str, IngestPipeline] = {}
+        self._timer: Optional[asyncio.Task] = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.ticks = 0
+        self.started = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self.leased = 0
+
+    async def _acquire(self, key: str, query: str, location: str, force: bool) -> str:
+        """Take the lease on `key`.
+
+        Returns 'started', 'leased' while another worker holds the lease, or 'fresh'
+        when the last run finished less than SCRAPE_MIN_REFRESH_MINUTES ago.
+        """
+        now = datetime.utcnow()
+        runs = get_collection('scrape_runs')
+        condition = {'_id': key, 'lease_until': {'$not': {'$gt': now}}}
+        if not force:
+            min_refresh = timedelta(minutes=settings.SCRAPE_MIN_REFRESH_MINUTES)
+            condition['finished_at'] = {'$not': {'$gt': now - min_refresh}}
+        lease = timedelta(minutes=settings.SCRAPE_LEASE_MINUTES)
+        try:
+            # no match on an existing key makes the upsert insert a duplicate _id
+            await runs.update_one(condition, {'$set': {
+                'query': query,
+                'location': location,
+                'status': 'running',
+                'started_at': now,
+                'lease_until': now + lease,
+                'owner': self._owner,
+            }}, upsert=True)
+        except DuplicateKeyError:
+            doc = await runs.find_one({'_id': key}, {'lease_until': 1})
+            lease_until = doc.get('lease_until') if doc else None
+            return 'leased' if lease_until and lease_until > now else 'fresh'
+        return 'started'
+
+    async def request_many(self, queries: List[str], location: str, limit: int, force: bool = False) -> Dict[str, str]:
+        """Start one run for every query that is neither running nor fresh.
+
+        Returns the outcome per key: 'started', 'running' (coalesced onto an
+        in-flight run in this process), 'leased' (running in another worker) or
+        'fresh' (refreshed too recently).
+        """
+        outcome, acquired = {}, []
+        for query in queries:
+            key = scrape_key(query, location)
+            if key in outcome:
+                continue
+            if key in self._inflight:
+                self.coalesced += 1
+                outcome[key] = 'running'
+                continue
+            outcome[key] = await self._acquire(key, query, location, force)
+            if outcome[key] == 'started':
+                acquired.append((key, query))
+            elif outcome[key] == 'leased':
+                self.leased += 1
+            else:
+                self.throttled += 1
+
+        if acquired:
+            self.started += 1
+            task = asyncio.create_task(self._run(acquired, location, limit))
+            for key, _ in acquired:
+                self._inflight[key] = task
+        return outcome
+
+    async def request(self, query: str, location: str, limit: int, force: bool = False) -> str:
+        outcome = await self.request_many([query], location, limit, force)
+        return outcome[scrape_key(query, location)]
+
+    async def _run(self, acquired: list, location: str, limit: int):
+        keys = [key for key, _ in acquired]
+        run_name = ', '.join(keys)
+        pipeline = self._pipelines[run_name] = IngestPipeline()
+        update = {'status': 'ok', 'error': None}
+        try:
+            result = await scrape_and_store([q for _, q in acquired], location, limit, pipeline)
+            update.update(result.as_dict())
+        except asyncio.CancelledError:
+            update['status'] = 'cancelled'
+            raise
+        except Exception as e:
+            logger.error(f"Scrape failed for {keys}: {e}", exc_info=True)
+            update.update(status='failed', error=str(e))
+        finally:
+            for key in keys:
+                self._inflight.pop(key, None)
+            self._pipelines.pop(run_name, None)
+            # always release the lease; a cancelled run does not count as a refresh
+            update.update(lease_until=None, pipeline=pipeline.stats())
+            if update['status'] != 'cancelled':
+                update['finished_at'] = datetime.utcnow()
+            try:
+                await get_collection('scrape_runs').update_many({'_id': {'$in': keys}}, {'$set': update})
+            except Exception as e:
+                logger.warning(f"Could not record scrape run for {keys}: {e}")
+
+    async def _periodic(self):
+        while True:
+            self.ticks += 1
+            try:
+                outcome = await self.request_many(settings.SCRAPE_QUERIES, settings.SCRAPE_LOCATION, settings.SCRAPE_LIMIT)
+                started = sum(1 for status in outcome.values() if status == 'started')
+                logger.info(f"Scheduled scrape tick {self.ticks}: {started}/{len(outcome)} queries started")
+            except Exception as e:
+                logger.warning(f"Scheduled scrape tick failed: {e}")
+            await asyncio.sleep(settings.SCRAPE_INTERVAL_MINUTES * 60)
+
+    def start(self):
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._periodic())
+            logger.info(f"Scrape scheduler started: every {settings.SCRAPE_INTERVAL_MINUTES} min")
+
+    async def stop(self):
+        keys = list(self._inflight)
+        tasks = set(self._inflight.values())
+        if self._timer is not None:
+            tasks.add(self._timer)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._timer = None
+        self._inflight.clear()
+        self._pipelines.clear()
+        if keys:
+            # runs cancelled before they started never reach _run's cleanup
+            try:
+                await get_collection('scrape_runs').update_many(
+                    {'_id': {'$in': keys}, 'owner': self._owner, 'status': 'running'},
+                    {'$set': {'status': 'cancelled', 'lease_until': None}},
+                )
+            except Exception as e:
+                logger.warning(f"Could not release scrape leases {keys}: {e}")
+
+    async def status(self) -> dict:
+        min_refresh = timedelta(minutes=settings.SCRAPE_MIN_REFRESH_MINUTES)
+        runs = []
+        cursor = get_collection('scrape_runs').find({}).sort('started_at', -1).limit(200)
+        async for doc in cursor:
+            finished_at = doc.get('finished_at')
+            runs.append({
+                'key': doc['_id'],
+                'query': doc.get('query'),
+                'location': doc.get('location'),
+                'status': doc.get('status'),
+                'started_at': doc.get('started_at'),
+                'finished_at': finished_at,
+                'inserted': doc.get('inserted'),
+                'updated': doc.get('updated'),
+                'skipped': doc.get('skipped'),
+                'error': doc.get('error'),
+                'owner': doc.get('owner'),
+                'pipeline': doc.get('pipeline'),
+                'next_allowed_at': finished_at + min_refresh if finished_at else None,
+            })
+        return {
+            'timer_running': self._timer is not None and not self._timer.done(),
+            'interval_minutes': settings.SCRAPE_INTERVAL_MINUTES,
+            'min_refresh_minutes': settings.SCRAPE_MIN_REFRESH_MINUTES,
+            'in_flight': sorted(self._inflight),
+            # live per-stage throughput and queue depths of the runs in progress
+            'pipelines': {name: pipeline.stats() for name, pipeline in self._pipelines.items()},
+            'ticks': self.ticks,
+            'runs_started': self.started,
+            'coalesced': self.coalesced,
+            'throttled': self.throttled,
+            'leased': self.leased,
+            'runs': runs,
+        }
+
+
+scrape_scheduler = ScrapeScheduler()
@@ -3,6 +3,8 @@ import docx
 from typing import Optional
 import logging
 
+from app.core.executors import run_in_parse_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -75,4 +77,9 @@ def extract_text(path: str, content_type: Optional[str] = None) -> str:
         raise
     except Exception as e:
         logger.exception(f"Text extraction failed: {e}")
-        raise ValueError(f"Erreur lors de l'extraction du texte: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Erreur lors de l'extraction du texte: {str(e)}")
+
+
+async def extract_text_async(path: str, content_type: Optional[str] = None) -> str:
+    """Run `extract_text` in the parse process pool so PDF parsing and OCR never block the event loop."""
+    return await run_in_parse_pool(extract_text, path, content_type)
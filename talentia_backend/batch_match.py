@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compute top-k job matches for many candidates and write them as JSON lines.
+
+Usage:
+    python batch_match.py [--ids ids.txt | --all] [--k 10] [--block 64] [--out matches.jsonl]
+
+Candidate ids are read one per line from --ids (or stdin), or every candidate with an
+embedding is used with --all. Results are written as each block of candidates finishes.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from app.core.config import settings
+from app.db import get_collection
+from app.nlp.batch_match import stream_batch_matches
+
+
+async def load_all_candidate_ids():
+    col = get_collection('candidates')
+    cursor = col.find({'embedding': {'$exists': True, '$ne': None}}, {'_id': 1})
+    return [str(doc['_id']) async for doc in cursor]
+
+
+async def batch_match(ids, k: int, block: int, out):
+    started = time.perf_counter()
+    matched = failed = 0
+    async for result in stream_batch_matches(ids, k, block):
+        out.write(json.dumps(result) + '\n')
+        if 'error' in result:
+            failed += 1
+        else:
+            matched += 1
+    out.flush()
+    elapsed = time.perf_counter() - started
+    print(f'✓ Matched {matched} candidates ({failed} skipped) in {elapsed:.1f}s', file=sys.stderr)
+
+
+async def main(args):
+    if args.all:
+        ids = await load_all_candidate_ids()
+    else:
+        source = open(args.ids) if args.ids else sys.stdin
+        ids = [line.strip() for line in source if line.strip()]
+    if not ids:
+        print('✗ No candidate ids given', file=sys.stderr)
+        return
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        await batch_match(ids, args.k, args.block, out)
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ids', help='file with one candidate id per line (default: stdin)')
+    parser.add_argument('--all', action='store_true', help='match every candidate with an embedding')
+    parser.add_argument('--k', type=int, default=10, help='matches per candidate')
+    parser.add_argument('--block', type=int, default=settings.MATCH_BATCH_BLOCK, help='candidates per block')
+    parser.add_argument('--out', help='output file (default: stdout)')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compare embedding backends against the fp32 PyTorch baseline.
+
+Usage:
+    python benchmark_embeddings.py [--backends torch-int8 onnx onnx-int8] [--n 512] [--from-db]
+
+For each backend prints encode throughput (texts/s) and the cosine agreement of its
+vectors with the fp32 `torch` vectors for the same texts, plus the overlap of the
+top-10 neighbours each backend finds within the sample.
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.nlp.backends import BACKENDS, load_backend
+
+_WORDS = (
+    "python java react docker kubernetes aws sql machine learning data pipeline backend "
+    "frontend api microservices agile scrum casablanca rabat remote senior junior stage cdi "
+    "analyst engineer developer devops cloud security testing product manager"
+).split()
+
+
+def synthetic_texts(n: int):
+    rng = np.random.default_rng(0)
+    return [
+        ' '.join(rng.choice(_WORDS, size=rng.integers(20, 200)))
+        for _ in range(n)
+    ]
+
+
+async def texts_from_db(n: int):
+    from app.db import get_collection
+    texts = []
+    cursor = get_collection('jobs').find({}, {'title': 1, 'company': 1, 'description': 1}).limit(n)
+    async for job in cursor:
+        texts.append(f"{job.get('title')}\n{job.get('company')}\n{job.get('description')}")
+    return texts
+
+
+def run(backend_name: str, texts, batch_size: int):
+    started = time.perf_counter()
+    backend = load_backend(backend_name, settings.EMBEDDING_MODEL)
+    load_s = time.perf_counter() - started
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    started = time.perf_counter()
+    vecs = backend.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    return vecs, len(texts) / elapsed, load_s
+
+
+def _normalized(vecs):
+    return vecs / np.clip(np.linalg.norm(vecs, axis=1, keepdims=True), 1e-12, None)
+
+
+def _top10(vecs):
+    sims = vecs @ vecs.T
+    np.fill_diagonal(sims, -np.inf)
+    return np.argsort(-sims, axis=1)[:, :10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', nargs='+', default=[b for b in BACKENDS if b != 'torch'])
+    parser.add_argument('--n', type=int, default=512, help='number of texts')
+    parser.add_argument('--batch-size', type=int, default=settings.EMBED_BATCH_SIZE)
+    parser.add_argument('--from-db', action='store_true', help='use job postings instead of synthetic text')
+    args = parser.parse_args()
+
+    texts = asyncio.run(texts_from_db(args.n)) if args.from_db else synthetic_texts(args.n)
+    print(f'{len(texts)} texts, model {settings.EMBEDDING_MODEL}, batch size {args.batch_size}\n')
+
+    base, base_tps, base_load = run('torch', texts, args.batch_size)
+    base = _normalized(base)
+    base_top = _top10(base)
+    print(f'{"backend":<12} {"load s":>7} {"texts/s":>9} {"speedup":>8} {"cos mean":>9} {"cos min":>8} {"top10":>6}')
+    print(f'{"torch":<12} {base_load:>7.1f} {base_tps:>9.1f} {1.0:>8.2f} {1.0:>9.4f} {1.0:>8.4f} {1.0:>6.3f}')
+
+    for name in args.backends:
+        try:
+            vecs, tps, load_s = run(name, texts, args.batch_size)
+        except RuntimeError as e:
+            print(f'{name:<12} unavailable: {e}')
+            continue
+        vecs = _normalized(vecs)
+        cos = (vecs * base).sum(axis=1)
+        overlap = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(_top10(vecs), base_top)])
+        print(f'{name:<12} {load_s:>7.1f} {tps:>9.1f} {tps / base_tps:>8.2f} '
+              f'{cos.mean():>9.4f} {cos.min():>8.4f} {overlap:>6.3f}')
+
+
+if __name__ == '__main__':
+    main()
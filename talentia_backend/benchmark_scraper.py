@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Compare sequential and async JSearch fetching against the local stand-in server.
+
+Usage:
+    python benchmark_scraper.py [--latency 0.3] [--queries 10] [--pages 1] [--concurrency 5]
+
+Both paths fetch the same (query, page) requests from `scrapers/jsearch_standin.py`
+without embedding, and report wall time, requests and TCP connections opened.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from app.core.config import settings
+from scrapers import api_scraper
+from scrapers.jsearch_standin import start_standin
+
+
+def run_sequential(queries, pages: int):
+    # the existing scraper fetches page 1 of each query; later pages the same way, one by one
+    jobs = api_scraper.scrape_jobs_with_api(queries, allow_mock=False, embed=False)
+    for page in range(2, pages + 1):
+        for q in queries:
+            url, params, headers = api_scraper._jsearch_request(q, 'Morocco', os.environ['RAPIDAPI_KEY'], page)
+            response = api_scraper.requests.get(url, headers=headers, params=params, timeout=15)
+            jobs += [api_scraper.parse_job(job_data) for job_data in response.json().get('data', [])]
+    return api_scraper._dedupe_by_url(jobs)
+
+
+async def run_async(queries, pages: int, concurrency: int):
+    # the fetch stage of app.ingest_pipeline: `concurrency` requests over the shared client
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(q, page):
+        async with semaphore:
+            records = await api_scraper.fetch_jsearch_records(q, 'Morocco', os.environ['RAPIDAPI_KEY'], page)
+        return [api_scraper.parse_job(job_data) for job_data in records]
+
+    try:
+        results = await asyncio.gather(*[fetch(q, page) for q in queries for page in range(1, pages + 1)])
+    finally:
+        await api_scraper.close_http_client()
+    return api_scraper._dedupe_by_url([job for jobs in results for job in jobs])
+
+
+def main(args):
+    server = start_standin(latency=args.latency)
+    settings.JSEARCH_BASE_URL = server.base_url
+    settings.JSEARCH_CONCURRENCY = args.concurrency
+    os.environ.setdefault('RAPIDAPI_KEY', 'dummy')
+    queries = (api_scraper.DEFAULT_QUERIES * (args.queries // len(api_scraper.DEFAULT_QUERIES) + 1))[:args.queries]
+    queries = [f"{q} {i}" if i >= len(api_scraper.DEFAULT_QUERIES) else q for i, q in enumerate(queries)]
+    print(f'Stand-in at {server.base_url}: {len(queries)} queries x {args.pages} page(s), {args.latency}s latency\n')
+    print(f'{"path":<12} {"wall (s)":>9} {"requests":>9} {"conns":>6} {"jobs":>6}')
+
+    results = {}
+    for name in ('sequential', 'async'):
+        server.requests = server.connections = 0
+        started = time.perf_counter()
+        if name == 'sequential':
+            jobs = run_sequential(queries, args.pages)
+        else:
+            jobs = asyncio.run(run_async(queries, args.pages, args.concurrency))
+        results[name] = time.perf_counter() - started
+        print(f'{name:<12} {results[name]:>9.2f} {server.requests:>9} {server.connections:>6} {len(jobs):>6}')
+
+    print(f'\n✓ async is {results["sequential"] / results["async"]:.1f}x faster')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.3, help='stand-in seconds per response')
+    parser.add_argument('--queries', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=settings.JSEARCH_CONCURRENCY)
+    main(parser.parse_args())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Backfill ingest dedup keys on stored jobs and delete duplicate postings.
+
+Usage:
+    python dedupe_jobs.py [--dry-run]
+
+Jobs stored before app.ingest existed have no `url_hash` / `fingerprint`, so the
+unique indexes do not cover them. The oldest document of each posting keeps its
+keys; later documents sharing a key are deleted. Restart the API afterwards so
+in-memory indexes drop the deleted jobs.
+"""
+
+import argparse
+import asyncio
+
+from pymongo import DeleteOne, UpdateOne
+
+from app.db import ensure_indexes, get_collection
+from app.ingest import job_keys
+
+
+async def dedupe(dry_run: bool):
+    col = get_collection('jobs')
+    seen = set()
+    ops, kept, duplicates = [], 0, 0
+    cursor = col.find({}, {'title': 1, 'company': 1, 'url': 1, 'url_hash': 1, 'fingerprint': 1}).sort('_id', 1)
+    async for doc in cursor:
+        keys = job_keys(doc)
+        if any(key in seen for key in keys.items()):
+            duplicates += 1
+            ops.append(DeleteOne({'_id': doc['_id']}))
+            continue
+        seen.update(keys.items())
+        kept += 1
+        if any(doc.get(field) != value for field, value in keys.items()):
+            ops.append(UpdateOne({'_id': doc['_id']}, {'$set': keys}))
+
+    print(f'✓ {kept} distinct jobs, {duplicates} duplicates')
+    if dry_run or not ops:
+        return
+    # delete duplicates before setting keys, so no update collides with a unique index
+    ops.sort(key=lambda op: not isinstance(op, DeleteOne))
+    for start in range(0, len(ops), 1000):
+        await col.bulk_write(ops[start:start + 1000], ordered=True)
+    await ensure_indexes()
+    print(f'✓ Deleted {duplicates} duplicates and backfilled keys')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dry-run', action='store_true', help='only report counts')
+    args = parser.parse_args()
+    asyncio.run(dedupe(args.dry_run))
@@ -0,0 +1,37 @@
+"""Gunicorn settings for multi-worker deployments (Linux / macOS).
+
+    gunicorn -c gunicorn_conf.py app.main:app
+
+With preload_app the embedding model is loaded once in the master before the
+workers are forked, so its weights are shared copy-on-write instead of being
+loaded again by every worker. Each worker still warms the model in its own
+startup hook. GET /admin/model reports RSS and PSS per worker to confirm the
+sharing (PSS drops as workers are added).
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, multiprocessing.cpu_count() // 2)))
+# read by app settings (loaded after this file) to size per-worker process pools
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def on_starting(server):
+    from app.core.config import settings
+    if not settings.PRELOAD_MODEL:
+        return
+    try:
+        from app.nlp.embeddings import get_model
+        get_model()
+    except Exception as e:
+        # e.g. OSError when the model cannot be fetched: serve anyway, embedding paths degrade
+        server.log.warning(f"Embedding model not preloaded in master: {e}")
+        return
+    # move everything allocated so far out of the GC's reach, so collections in the
+    # workers don't touch (and un-share) the inherited objects
+    gc.freeze()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Precompute every candidate's top-k jobs into the `matches` collection.
+
+Usage:
+    python materialize_matches.py [--k 20] [--block 256] [--workers N]
+
+Candidate embeddings are scored against the job matrix in blocks of --block
+candidates, several blocks in parallel (NumPy releases the GIL during the matrix
+products). Each finished block is bulk-written as one document per candidate:
+
+    {_id: candidate_id, matches: [{job_id, similarity}], k, job_count, computed_at}
+
+`/jobs/match/{candidate_id}` serves these while they are younger than
+MATERIALIZED_MATCHES_MAX_AGE_HOURS. Entries of candidates that no longer have an
+embedding are removed at the end of the run.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from pymongo import ReplaceOne
+
+from app.core.config import settings
+from app.core.executors import available_cores
+from app.db import get_collection
+from app.nlp.batch_match import top_k_blocked
+from app.nlp.vector_index import VectorIndex
+
+
+async def materialize(k: int, block: int, workers: int):
+    started = time.perf_counter()
+    jobs = VectorIndex('jobs')
+    candidates = VectorIndex('candidates')
+    await jobs.ensure_loaded()
+    await candidates.ensure_loaded()
+    if not len(jobs) or not len(candidates):
+        print(f'✗ Nothing to match ({len(candidates)} candidates, {len(jobs)} jobs)')
+        return
+    if candidates.dim != jobs.dim:
+        print(f'✗ Candidate embeddings ({candidates.dim}d) do not match job embeddings ({jobs.dim}d)')
+        return
+    print(f'✓ Loaded {len(candidates)} candidates and {len(jobs)} jobs in {time.perf_counter() - started:.1f}s')
+
+    matches_col = get_collection('matches')
+    computed_at = datetime.utcnow()
+    loop = asyncio.get_running_loop()
+    job_ids, job_matrix = jobs.ids, jobs.matrix
+    candidate_ids, candidate_matrix = candidates.ids, candidates.matrix
+
+    def score(start: int):
+        hits = top_k_blocked(job_matrix, job_ids, candidate_matrix[start:start + block], k,
+                             settings.MATCH_BATCH_JOB_BLOCK)
+        return start, hits
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = [loop.run_in_executor(pool, score, start) for start in range(0, len(candidates), block)]
+        for finished in asyncio.as_completed(pending):
+            start, hits = await finished
+            requests = [
+                ReplaceOne({'_id': candidate_id}, {
+                    'matches': [{'job_id': job_id, 'similarity': similarity} for job_id, similarity in row],
+                    'k': k,
+                    'job_count': len(jobs),
+                    'computed_at': computed_at,
+                }, upsert=True)
+                for candidate_id, row in zip(candidate_ids[start:start + block], hits)
+            ]
+            await matches_col.bulk_write(requests, ordered=False)
+            written += len(requests)
+            print(f'  {written}/{len(candidates)} candidates written', end='\r')
+
+    stale = await matches_col.delete_many({'computed_at': {'$lt': computed_at}})
+    print(f'✓ Materialized top-{k} matches for {written} candidates in {time.perf_counter() - started:.1f}s')
+    if stale.deleted_count:
+        print(f'✓ Removed {stale.deleted_count} stale entries')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--k', type=int, default=settings.MATERIALIZED_MATCHES_K, help='jobs stored per candidate')
+    parser.add_argument('--block', type=int, default=256, help='candidates scored per block')
+    parser.add_argument('--workers', type=int, default=available_cores(), help='blocks scored in parallel')
+    args = parser.parse_args()
+    asyncio.run(materialize(args.k, args.block, args.workers))
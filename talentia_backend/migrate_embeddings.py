@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Convert stored embeddings to the compact Binary format (or back).
+
+Usage:
+    python migrate_embeddings.py [--dtype float32|float16|list] [--collections jobs candidates]
+                                 [--batch-size 1000] [--dry-run]
+
+Reads accept both formats, so this can run while the server is live; re-running it
+only touches documents not yet in the target format.
+"""
+
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db import get_collection
+from app.nlp.vector_codec import decode_embedding, encode_embedding, storage_format
+
+
+async def migrate_collection(name: str, dtype: str, batch_size: int, dry_run: bool):
+    col = get_collection(name)
+    cursor = col.find({'embedding': {'$type': ['array', 'binData']}}, {'embedding': 1})
+    converted = skipped = 0
+    ops = []
+
+    async def flush():
+        nonlocal ops
+        if ops and not dry_run:
+            await col.bulk_write(ops, ordered=False)
+        ops = []
+
+    async for doc in cursor:
+        current = doc['embedding']
+        if storage_format(current) == dtype:
+            skipped += 1
+            continue
+        vec = decode_embedding(current)
+        if vec is None:
+            skipped += 1
+            continue
+        ops.append(UpdateOne({'_id': doc['_id']}, {'$set': {'embedding': encode_embedding(vec, dtype)}}))
+        converted += 1
+        if len(ops) >= batch_size:
+            await flush()
+    await flush()
+
+    verb = 'Would convert' if dry_run else 'Converted'
+    print(f'✓ {name}: {verb} {converted} embeddings to {dtype} ({skipped} already converted or unreadable)')
+
+
+async def migrate(collections, dtype: str, batch_size: int, dry_run: bool):
+    for name in collections:
+        await migrate_collection(name, dtype, batch_size, dry_run)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dtype', choices=['float32', 'float16', 'list'], default=settings.EMBEDDING_STORAGE_DTYPE)
+    parser.add_argument('--collections', nargs='+', default=['jobs', 'candidates'])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(migrate(args.collections, args.dtype, args.batch_size, args.dry_run))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Rebuild the FAISS ANN index used when MATCH_BACKEND=ann and report its recall@k.
+
+Usage:
+    python rebuild_ann_index.py [--nlist 1024] [--k 10] [--queries 200]
+
+Recall is measured against the exact matrix scan for a sample of candidate embeddings
+(or job embeddings when no candidates exist) at several nprobe values, so ANN_NPROBE
+can be picked from the printed latency / recall tradeoff.
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.nlp.ann_index import build_ann_index, load_faiss
+from app.nlp.vector_index import VectorIndex
+
+
+def report_recall(matrix: np.ndarray, queries: np.ndarray, path: str, k: int):
+    faiss = load_faiss()
+    index = faiss.read_index(path)
+    k = min(k, len(matrix))
+
+    exact = np.argpartition(-(queries @ matrix.T), k - 1, axis=1)[:, :k]
+    print(f'\nrecall@{k} over {len(queries)} queries (exact scan = 1.000)')
+    print(f'{"nprobe":>8} {"recall":>8} {"ms/query":>10}')
+    nprobe = 1
+    while nprobe <= index.nlist:
+        index.nprobe = nprobe
+        started = time.perf_counter()
+        _, labels = index.search(queries, k)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / len(queries)
+        hits = sum(len(set(a) & set(b)) for a, b in zip(exact, labels))
+        marker = '  <- ANN_NPROBE' if nprobe == settings.ANN_NPROBE else ''
+        print(f'{nprobe:>8} {hits / exact.size:>8.3f} {elapsed_ms:>10.3f}{marker}')
+        nprobe *= 2
+
+
+async def rebuild(nlist: int, k: int, n_queries: int):
+    jobs = VectorIndex('jobs')
+    await jobs.ensure_loaded()
+    if not len(jobs):
+        print('✗ No job embeddings found, nothing to index')
+        return
+
+    started = time.perf_counter()
+    used_nlist = build_ann_index(list(jobs.ids), jobs.matrix, settings.ANN_INDEX_PATH, nlist)
+    print(f'✓ Indexed {len(jobs)} jobs (nlist={used_nlist}) in {time.perf_counter() - started:.1f}s')
+    print(f'  -> {settings.ANN_INDEX_PATH}')
+
+    if n_queries <= 0:
+        return
+    candidates = VectorIndex('candidates')
+    await candidates.ensure_loaded()
+    source = candidates if len(candidates) and candidates.dim == jobs.dim else jobs
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(source), min(n_queries, len(source)), replace=False)
+    report_recall(jobs.matrix, np.ascontiguousarray(source.matrix[sample]), settings.ANN_INDEX_PATH, k)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nlist', type=int, default=settings.ANN_NLIST, help='number of IVF lists')
+    parser.add_argument('--k', type=int, default=10, help='k used for recall@k')
+    parser.add_argument('--queries', type=int, default=200, help='queries sampled for recall (0 to skip)')
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.nlist, args.k, args.queries))
@@ -1,4 +1,5 @@
 import requests
+import httpx
 import logging
 from datetime import datetime, timedelta
 import os
@@ -7,12 +8,28 @@ from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv()
 
-from app.nlp.embeddings import embed_text
+from app.core.config import settings
+from app.nlp.embeddings import embed_jobs
 
 # Logger configuration
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+DEFAULT_QUERIES = [
+    "data scientist",
+    "software engineer",
+    "backend developer",
+    "frontend developer",
+    "full stack developer",
+    "machine learning engineer",
+    "devops engineer",
+    "product manager",
+    "qa tester",
+    "business analyst"
+]
+
+_http_client = None
+
 # Mock jobs as fallback
 MOCK_JOBS = [
     {
@@ -53,8 +70,78 @@ def map_employment_type(api_type: str):
     }
     return mapping.get(api_type, "Unknown")
 
-def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
-    """Scrape jobs using JSearch API (RapidAPI)."""
+def _jsearch_request(keyword: str, location: str, api_key: str, page: int = 1):
+    """URL, query string and headers for one page of JSearch results."""
+    url = f"{settings.JSEARCH_BASE_URL}/search"
+    querystring = {
+        "query": f"{keyword} in {location}",
+        "page": str(page),
+        "num_pages": "1",
+        "date_posted": "month"
+    }
+    headers = {
+        "X-RapidAPI-Key": api_key,
+        "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+    }
+    return url, querystring, headers
+
+
+def parse_job(job_data: dict) -> dict:
+    """Map one JSearch result to our job document."""
+    title = job_data.get('job_title', 'Unknown Position')
+    company = job_data.get('employer_name', 'Unknown Company')
+    description = job_data.get('job_description', '')
+    job_url = job_data.get('job_apply_link') or job_data.get('job_google_link', '')
+    city = job_data.get('job_city', '')
+    country = job_data.get('job_country', '')
+    job_location = f"{city}, {country}" if city else country
+
+    # Correct employment type mapping
+    employment_type = job_data.get('job_employment_type', '')
+    job_type = map_employment_type(employment_type)
+
+    # Salary
+    salary = None
+    if job_data.get('job_min_salary') and job_data.get('job_max_salary'):
+        currency = job_data.get('job_salary_currency', 'MAD')
+        period = job_data.get('job_salary_period', 'MONTH')
+        salary = f"{job_data['job_min_salary']:,.0f} - {job_data['job_max_salary']:,.0f} {currency}/{period}"
+
+    # Experience
+    experience = None
+    exp_data = job_data.get('job_required_experience', {})
+    if exp_data:
+        req_exp = exp_data.get('required_experience_in_months')
+        if req_exp:
+            years = req_exp / 12
+            experience = f"{years:.0f}+ ans" if years >= 1 else "< 1 an"
+
+    # Posted date
+    posted_timestamp = job_data.get('job_posted_at_timestamp')
+    posted_date = datetime.fromtimestamp(posted_timestamp) if posted_timestamp else datetime.utcnow()
+
+    return {
+        'title': title,
+        'company': company,
+        'description': description,
+        'url': job_url,
+        'location': job_location,
+        'type': job_type,
+        'salary': salary,
+        'experience': experience,
+        'embedding': None,
+        'scraped_at': datetime.utcnow(),
+        'posted_date': posted_date,
+        'source': 'jsearch_api'
+    }
+
+
+def scrape_jsearch_api(keyword: str, location: str, limit: int = 10, embed: bool = True):
+    """Scrape jobs using JSearch API (RapidAPI).
+
+    With embed=False the jobs are returned without embeddings so the caller can embed
+    a larger, de-duplicated batch at once.
+    """
     api_key = os.getenv('RAPIDAPI_KEY')
     if not api_key:
         logger.warning("No RAPIDAPI_KEY found in .env")
@@ -62,17 +149,7 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
 
     try:
         logger.info(f"Fetching REAL jobs from JSearch API: {keyword} in {location}")
-        url = "https://jsearch.p.rapidapi.com/search"
-        querystring = {
-            "query": f"{keyword} in {location}",
-            "page": "1",
-            "num_pages": "1",
-            "date_posted": "month"
-        }
-        headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-        }
+        url, querystring, headers = _jsearch_request(keyword, location, api_key)
 
         response = requests.get(url, headers=headers, params=querystring, timeout=15)
         if response.status_code != 200:
@@ -80,64 +157,10 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
             return None
 
         data = response.json()
-        jobs = []
-
-        for job_data in data.get('data', [])[:limit]:
-            title = job_data.get('job_title', 'Unknown Position')
-            company = job_data.get('employer_name', 'Unknown Company')
-            description = job_data.get('job_description', '')
-            job_url = job_data.get('job_apply_link') or job_data.get('job_google_link', '')
-            city = job_data.get('job_city', '')
-            country = job_data.get('job_country', '')
-            job_location = f"{city}, {country}" if city else country
-
-            # Correct employment type mapping
-            employment_type = job_data.get('job_employment_type', '')
-            job_type = map_employment_type(employment_type)
-
-            # Salary
-            salary = None
-            if job_data.get('job_min_salary') and job_data.get('job_max_salary'):
-                currency = job_data.get('job_salary_currency', 'MAD')
-                period = job_data.get('job_salary_period', 'MONTH')
-                salary = f"{job_data['job_min_salary']:,.0f} - {job_data['job_max_salary']:,.0f} {currency}/{period}"
-
-            # Experience
-            experience = None
-            exp_data = job_data.get('job_required_experience', {})
-            if exp_data:
-                req_exp = exp_data.get('required_experience_in_months')
-                if req_exp:
-                    years = req_exp / 12
-                    experience = f"{years:.0f}+ ans" if years >= 1 else "< 1 an"
-
-            # Posted date
-            posted_timestamp = job_data.get('job_posted_at_timestamp')
-            posted_date = datetime.fromtimestamp(posted_timestamp) if posted_timestamp else datetime.utcnow()
-
-            # Embedding
-            text = f"{title}\n{company}\n{description}"
-            try:
-                embedding = embed_text(text)
-            except Exception as e:
-                logger.warning(f"Embedding failed for job {title}: {e}")
-                embedding = None
-
-            jobs.append({
-                'title': title,
-                'company': company,
-                'description': description,
-                'url': job_url,
-                'location': job_location,
-                'type': job_type,
-                'salary': salary,
-                'experience': experience,
-                'embedding': embedding,
-                'scraped_at': datetime.utcnow(),
-                'posted_date': posted_date,
-                'source': 'jsearch_api'
-            })
+        jobs = [parse_job(job_data) for job_data in data.get('data', [])[:limit]]
 
+        if embed:
+            embed_jobs(jobs)
         logger.info(f"Successfully fetched {len(jobs)} jobs from JSearch API")
         return jobs
 
@@ -146,66 +169,101 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
         return None
 
 
-def scrape_jobs_with_api(query_list=None, location="Morocco", limit=10, allow_mock=True):
-    """Scrape multiple IT-related jobs using JSearch API, fallback to mock."""
+def _dedupe_by_url(jobs: list) -> list:
+    seen_urls = set()
+    unique_jobs = []
+    for job in jobs:
+        if job['url'] not in seen_urls:
+            seen_urls.add(job['url'])
+            unique_jobs.append(job)
+    return unique_jobs
+
+
+def mock_jobs(limit: int) -> list:
+    jobs = []
+    for job_data in MOCK_JOBS[:limit]:
+        jobs.append({
+            'title': job_data['title'],
+            'company': job_data['company'],
+            'description': job_data['description'],
+            'url': job_data['url'],
+            'location': job_data['location'],
+            'type': job_data['type'],
+            'salary': job_data.get('salary'),
+            'experience': job_data.get('experience'),
+            'embedding': None,
+            'scraped_at': datetime.utcnow(),
+            'posted_date': job_data['posted_date'],
+            'source': 'mock'
+        })
+    return jobs
+
+
+def scrape_jobs_with_api(query_list=None, location="Morocco", limit=10, allow_mock=True, embed=True):
+    """Scrape multiple IT-related jobs using JSearch API, fallback to mock.
+
+    Queries are fetched one after another; the app streams JSearch results through
+    `app.ingest_pipeline.ingest_jsearch` instead.
+    """
     if query_list is None:
-        query_list = [
-            "data scientist",
-            "software engineer",
-            "backend developer",
-            "frontend developer",
-            "full stack developer",
-            "machine learning engineer",
-            "devops engineer",
-            "product manager",
-            "qa tester",
-            "business analyst"
-        ]
+        query_list = DEFAULT_QUERIES
+    elif isinstance(query_list, str):
+        query_list = [query_list]
 
     logger.info(f"Scraping jobs in {location} with keywords: {query_list}")
     all_jobs = []
 
     for q in query_list:
-        jobs = scrape_jsearch_api(q, location, limit)
+        jobs = scrape_jsearch_api(q, location, limit, embed=False)
         if jobs:
             all_jobs.extend(jobs)
 
     # Remove duplicates based on URL
-    seen_urls = set()
-    unique_jobs = []
-    for job in all_jobs:
-        if job['url'] not in seen_urls:
-            seen_urls.add(job['url'])
-            unique_jobs.append(job)
+    unique_jobs = _dedupe_by_url(all_jobs)
 
     # Fallback to mock jobs
     if not unique_jobs and allow_mock:
         logger.info("Using mock jobs as fallback")
-        for job_data in MOCK_JOBS[:limit]:
-            text = f"{job_data['title']}\n{job_data['company']}\n{job_data['description']}"
-            try:
-                embedding = embed_text(text)
-            except Exception as e:
-                logger.warning(f"Embedding failed: {e}")
-                embedding = None
-            unique_jobs.append({
-                'title': job_data['title'],
-                'company': job_data['company'],
-                'description': job_data['description'],
-                'url': job_data['url'],
-                'location': job_data['location'],
-                'type': job_data['type'],
-                'salary': job_data.get('salary'),
-                'experience': job_data.get('experience'),
-                'embedding': embedding,
-                'scraped_at': datetime.utcnow(),
-                'posted_date': job_data['posted_date'],
-                'source': 'mock'
-            })
+        unique_jobs = mock_jobs(limit)
 
+    if embed:
+        embed_jobs(unique_jobs)
     return unique_jobs
 
 
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide async HTTP client; its keep-alive pool is reused across scrape runs."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=settings.JSEARCH_CONCURRENCY * 2,
+            max_keepalive_connections=settings.JSEARCH_CONCURRENCY * 2,
+        )
+        _http_client = httpx.AsyncClient(timeout=15, limits=limits)
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def fetch_jsearch_records(keyword: str, location: str, api_key: str, page: int = 1) -> list:
+    """Raw JSearch results for one page (empty on error), over the shared client."""
+    url, querystring, headers = _jsearch_request(keyword, location, api_key, page)
+    try:
+        response = await get_http_client().get(url, headers=headers, params=querystring)
+        if response.status_code != 200:
+            logger.warning(f"JSearch API returned status {response.status_code} for {keyword!r} page {page}")
+            return []
+        return response.json().get('data', [])
+    except Exception as e:
+        logger.warning(f"JSearch API request failed for {keyword!r} page {page}: {e}")
+        return []
+
+
 if __name__ == "__main__":
     print("Testing IT job scraper...\n")
     jobs = scrape_jobs_with_api(limit=10, allow_mock=True)
@@ -5,9 +5,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from app.nlp.embeddings import embed_text
-from app.db import get_collection
+from app.nlp.embeddings import embed_jobs
+from app.ingest import ingest_jobs
 from datetime import datetime, timedelta
+import asyncio
 import logging
 import time
 import re
@@ -52,6 +53,7 @@ def scrape_linkedin_jobs(query: str, location: str = "", days: int = 15, limit:
         limit: Maximum number of jobs to scrape
     """
     jobs = []
+    embedding_texts = []
 
     try:
         # Setup Chrome options with better anti-detection
@@ -318,10 +320,6 @@ def scrape_linkedin_jobs(query: str, location: str = "", days: int = 15, limit:
                     logger.warning(f"Could not get full job details: {e}")
                     description = f"{title} - {company}" if title and company else (title or company or "Job description not available")
                 
-                # Create embedding
-                text = f"{title}\n{company}\n{description}"
-                embedding = embed_text(text)
-                
                 jobs.append({
                     'title': title,
                     'company': company,
@@ -331,11 +329,12 @@ def scrape_linkedin_jobs(query: str, location: str = "", days: int = 15, limit:
                     'type': job_type,
                     'salary': salary,
                     'experience': experience,
-                    'embedding': embedding,
+                    'embedding': None,
                     'scraped_at': datetime.utcnow(),
                     'posted_date': posted_date,
                     'source': 'linkedin'
                 })
+                embedding_texts.append(f"{title}\n{company}\n{description}")
                 
                 logger.info(f"Scraped LinkedIn job: {title} at {company}")
                 
@@ -344,6 +343,7 @@ def scrape_linkedin_jobs(query: str, location: str = "", days: int = 15, limit:
                 continue
         
         driver.quit()
+        embed_jobs(jobs, embedding_texts)
         logger.info(f"Successfully scraped {len(jobs)} jobs from LinkedIn")
         
     except Exception as e:
@@ -391,6 +391,7 @@ def scrape_indeed_jobs(q: str, location: str = "", limit: int = 20, minimal: boo
             raise Exception("No job listings found")
 
         jobs = []
+        embedding_texts = []
         for c in cards:
             title_el = c.select_one('h2.title')
             company_el = c.select_one('span.company')
@@ -450,8 +451,6 @@ def scrape_indeed_jobs(q: str, location: str = "", limit: int = 20, minimal: boo
                 if exp_match:
                     experience = f"{exp_match.group(1)}+ ans"
 
-                text = f"{title}\n{company}\n{summary}"
-                emb = embed_text(text)
                 jobs.append({
                     'title': title,
                     'company': company,
@@ -461,13 +460,16 @@ def scrape_indeed_jobs(q: str, location: str = "", limit: int = 20, minimal: boo
                     'type': job_type,
                     'salary': salary,
                     'experience': experience,
-                    'embedding': emb,
+                    'embedding': None,
                     'scraped_at': datetime.utcnow(),
                     'posted_date': datetime.utcnow(),
                     'source': 'indeed'
                 })
+                embedding_texts.append(f"{title}\n{company}\n{summary}")
 
         if jobs:
+            if not minimal:
+                embed_jobs(jobs, embedding_texts)
             logger.info(f"Successfully scraped {len(jobs)} jobs from Indeed (minimal={minimal})")
             return jobs
         else:
@@ -500,39 +502,22 @@ def scrape_all_sources(query: str, location: str = "", days: int = 15, limit: in
         logger.warning("LinkedIn scraping failed. Using mock data.")
         for job_data in MOCK_JOBS[:limit]:
             # Full mock data with all details
-            text = f"{job_data['title']}\n{job_data['company']}\n{job_data['description']}"
-            emb = embed_text(text)
-            job_data['embedding'] = emb
             job_data['scraped_at'] = datetime.utcnow()
             job_data['source'] = 'mock'
             all_jobs.append(job_data)
+        embed_jobs(all_jobs, [
+            f"{j['title']}\n{j['company']}\n{j['description']}" for j in all_jobs
+        ])
 
     logger.info(f"Total jobs scraped from LinkedIn: {len(all_jobs)}")
     return all_jobs
 
 
-def ingest_to_mongo(jobs):
-    """Save jobs to MongoDB, avoiding duplicates."""
-    col = get_collection('jobs')
-    inserted = 0
-    
-    for j in jobs:
-        # Check if job already exists (by URL or title+company)
-        existing = col.find_one({
-            '$or': [
-                {'url': j.get('url')},
-                {'title': j['title'], 'company': j['company']}
-            ]
-        })
-        
-        if not existing:
-            col.insert_one(j)
-            inserted += 1
-        else:
-            logger.debug(f"Job already exists: {j['title']} at {j['company']}")
-    
-    logger.info(f"Inserted {inserted} new jobs into database")
-    return inserted
+async def ingest_to_mongo(jobs):
+    """Save jobs to MongoDB, updating postings that are already stored (see app.ingest)."""
+    result = await ingest_jobs(jobs)
+    logger.info(f"Saved jobs to database: {result.as_dict()}")
+    return result
 
 
 if __name__ == '__main__':
@@ -541,4 +526,4 @@ if __name__ == '__main__':
     print(f'Scraped {len(items)} jobs')
     
     # Save to database
-    ingest_to_mongo(items)
\ No newline at end of file
+    asyncio.run(ingest_to_mongo(items))
\ No newline at end of file
@@ -6,7 +6,7 @@ from dotenv import load_dotenv
 import re
 
 load_dotenv()
-from app.nlp.embeddings import embed_text
+from app.nlp.embeddings import embed_jobs
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -53,15 +53,25 @@ def extract_skills_from_text(text: str) -> list:
     
     skills = []
     for pattern in skill_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                skills.append(match.group(0))
-    
-    return list(set(skills))
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            skills.append(match.group(0))
+
+    # pattern order, so a re-scrape stores the same list and ingest sees no change
+    return skills
+
+def _embed_jobs(jobs: list, texts: list):
+    """`embed_jobs`, plus the `has_embedding` flag stored with these jobs."""
+    embed_jobs(jobs, texts)
+    for job in jobs:
+        job['has_embedding'] = job['embedding'] is not None
 
-def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
-    """Scrape jobs using JSearch API with comprehensive data extraction."""
+def scrape_jsearch_api(keyword: str, location: str, limit: int = 10, embed: bool = True):
+    """Scrape jobs using JSearch API with comprehensive data extraction.
+
+    With embed=False the jobs are returned without embeddings (each carries its
+    `embedding_text`) so the caller can embed a de-duplicated batch at once.
+    """
     api_key = os.getenv('RAPIDAPI_KEY')
     if not api_key:
         logger.warning("No RAPIDAPI_KEY found in .env")
@@ -88,6 +98,7 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
 
         data = response.json()
         jobs = []
+        embedding_texts = []
 
         for job_data in data.get('data', [])[:limit]:
             title = job_data.get('job_title', 'Unknown Position')
@@ -145,14 +156,6 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
             Qualifications: {' '.join(qualifications)}
             """.strip()
             
-            try:
-                embedding = embed_text(embedding_text)
-                has_embedding = True
-            except Exception as e:
-                logger.warning(f"Embedding failed for job {title}: {e}")
-                embedding = None
-                has_embedding = False
-            
             job = {
                 'title': title,
                 'company': company,
@@ -171,13 +174,19 @@ def scrape_jsearch_api(keyword: str, location: str, limit: int = 10):
                 'employer_logo': employer_logo,
                 'scraped_at': datetime.utcnow(),
                 'posted_date': posted_date,
-                'embedding': embedding,
-                'has_embedding': has_embedding,
+                'embedding': None,
+                'has_embedding': False,
                 'source': 'jsearch_api'
             }
             
             jobs.append(job)
+            embedding_texts.append(embedding_text)
 
+        if embed:
+            _embed_jobs(jobs, embedding_texts)
+        else:
+            for job, embedding_text in zip(jobs, embedding_texts):
+                job['embedding_text'] = embedding_text
         logger.info(f"Successfully fetched {len(jobs)} jobs from JSearch API")
         return jobs
 
@@ -198,7 +207,7 @@ def scrape_jobs_with_api(query_list=None, location="Morocco", limit=10, allow_mo
     all_jobs = []
 
     for q in query_list:
-        jobs = scrape_jsearch_api(q, location, limit)
+        jobs = scrape_jsearch_api(q, location, limit, embed=False)
         if jobs:
             all_jobs.extend(jobs)
 
@@ -208,22 +217,19 @@ def scrape_jobs_with_api(query_list=None, location="Morocco", limit=10, allow_mo
         if job['url'] not in seen_urls:
             seen_urls.add(job['url'])
             unique_jobs.append(job)
+    _embed_jobs(unique_jobs, [job.pop('embedding_text') for job in unique_jobs])
 
     if not unique_jobs and allow_mock:
         logger.info("Using mock jobs as fallback")
         for job_data in MOCK_JOBS[:limit]:
-            text = f"{job_data['title']}\n{job_data['company']}\n{job_data['description']}"
-            try:
-                embedding = embed_text(text)
-            except:
-                embedding = None
             unique_jobs.append({
                 **job_data,
                 'skills': extract_skills_from_text(job_data['description']),
-                'embedding': embedding,
-                'has_embedding': embedding is not None,
                 'scraped_at': datetime.utcnow(),
                 'source': 'mock'
             })
+        _embed_jobs(unique_jobs, [
+            f"{j['title']}\n{j['company']}\n{j['description']}" for j in unique_jobs
+        ])
 
     return unique_jobs
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Local stand-in for the JSearch API, serving the responses in fixtures/jsearch.
+
+Each request sleeps for a configurable latency and returns one of the fixture
+files (picked from the query and page), with apply links made unique per query
+and page so de-duplication behaves as with real results. Connections are
+counted so benchmarks can show keep-alive reuse.
+
+    python -m scrapers.jsearch_standin --port 8765 --latency 0.3
+    JSEARCH_BASE_URL=http://127.0.0.1:8765 RAPIDAPI_KEY=dummy python run_server.py
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'jsearch')
+
+
+def load_fixtures(directory: str = FIXTURES_DIR) -> list:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures.append(json.load(f))
+    if not fixtures:
+        raise RuntimeError(f"No JSearch fixtures found in {directory}")
+    return fixtures
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float, fixtures: list):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.fixtures = fixtures
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.count('connections')
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/search':
+            self.send_error(404)
+            return
+        params = parse_qs(url.query)
+        query = params.get('query', [''])[0]
+        page = params.get('page', ['1'])[0]
+        self.server.count('requests')
+        time.sleep(self.server.latency)
+
+        fixtures = self.server.fixtures
+        response = dict(fixtures[zlib.crc32(f"{query}|{page}".encode()) % len(fixtures)])
+        tag = zlib.crc32(f"{query}|{page}".encode())
+        response['parameters'] = {**response.get('parameters', {}), 'query': query, 'page': int(page)}
+        response['data'] = [
+            {**job, 'job_apply_link': f"{job.get('job_apply_link')}?q={tag}"} for job in response.get('data', [])
+        ]
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin(port: int = 0, latency: float = 0.3, host: str = '127.0.0.1') -> StandinServer:
+    """Start the stand-in on a background thread; `port=0` picks a free port."""
+    server = StandinServer((host, port), latency, load_fixtures())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds per response')
+    args = parser.parse_args()
+    server = StandinServer(('127.0.0.1', args.port), args.latency, load_fixtures())
+    print(f'✓ JSearch stand-in on {server.base_url} ({len(server.fixtures)} fixtures, {args.latency}s latency)')
+    server.serve_forever()
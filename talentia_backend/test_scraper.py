@@ -5,6 +5,7 @@ import asyncio
 import sys
 from scrapers.indeed_scraper import scrape
 from app.db import get_collection
+from app.ingest import ingest_jobs
 
 async def test_scraper():
     """Test the scraper and database insertion."""
@@ -25,14 +26,9 @@ async def test_scraper():
     try:
         jobs_col = get_collection('jobs')
         
-        # Remove _id fields
-        for j in jobs:
-            if '_id' in j:
-                del j['_id']
-        
-        # Insert jobs
-        result = await jobs_col.insert_many(jobs)
-        print(f"✓ Inserted {len(result.inserted_ids)} jobs into database")
+        # Upsert jobs
+        result = await ingest_jobs(jobs)
+        print(f"✓ Ingested jobs: {result.inserted} inserted, {result.updated} updated, {result.skipped} skipped")
         
         # Verify insertion
         count = await jobs_col.count_documents({})
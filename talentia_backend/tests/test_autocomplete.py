@@ -0,0 +1,50 @@
+"""Short prefixes must rank every matching phrase, not only the first keys in order."""
+import random
+
+from app.nlp import autocomplete
+from app.nlp.autocomplete import PrefixIndex
+
+
+def _index(docs):
+    index = PrefixIndex('jobs')
+    index.add_documents(docs)
+    index._loaded = True
+    return index
+
+
+def test_one_letter_prefix_returns_most_used_phrase():
+    docs = [{'_id': i, 'title': f'Sales Associate {i}'} for i in range(6000)]
+    docs += [{'_id': 6000 + i, 'title': 'Software Engineer'} for i in range(1000)]
+    index = _index(docs)
+
+    assert index.suggest('s', 3)[0] == {'text': 'Software Engineer', 'kind': 'title', 'count': 1000}
+
+
+def test_short_prefix_top_list_follows_ingest_and_deletes(monkeypatch):
+    # a short list, so phrases keep entering and leaving it
+    monkeypatch.setattr(autocomplete, '_TOP_K', 4)
+    rng = random.Random(0)
+    titles = [f'{a} {b}' for a in ('Sales', 'Senior', 'Data', 'Dev') for b in ('Lead', 'Analyst', 'Scientist')]
+    docs = {i: rng.choice(titles) for i in range(300)}
+    index = _index({'_id': i, 'title': t} for i, t in docs.items())
+    index.suggest('s', 3)
+    index.suggest('sa', 3, kind='title')
+
+    for step in range(2000):
+        _id = rng.randrange(400)
+        if rng.random() < 0.3:
+            docs.pop(_id, None)
+            index.remove([_id])
+        else:
+            docs[_id] = rng.choice(titles)
+            index.add_documents([{'_id': _id, 'title': docs[_id]}])
+        for prefix in ('s', 'sa', 'd'):
+            counts = {}
+            for title in docs.values():
+                if any(word.lower().startswith(prefix) for word in title.split()):
+                    counts[title] = counts.get(title, 0) + 1
+            expected = sorted(
+                ((title.lower().startswith(prefix), n) for title, n in counts.items()), reverse=True
+            )[:3]
+            got = [(s['text'].lower().startswith(prefix), s['count']) for s in index.suggest(prefix, 3)]
+            assert got == expected, (step, prefix)
@@ -0,0 +1,15 @@
+"""Dedup keys must tell distinct postings apart."""
+from app.ingest import normalize_url, url_hash
+
+
+def test_tracking_parameters_are_dropped():
+    assert normalize_url('https://Jobs.Example.com/view/42/?utm_source=x&trk=a&refId=b&gclid=c#apply') == \
+        'https://jobs.example.com/view/42'
+
+
+def test_identifying_parameters_are_kept():
+    first = 'https://careers.acme.com/job?refNum=ABC123'
+    second = 'https://careers.acme.com/job?refNum=XYZ999'
+    assert normalize_url(first) == 'https://careers.acme.com/job?refNum=ABC123'
+    assert url_hash(first) != url_hash(second)
+    assert normalize_url('https://careers.acme.com/job?reference=7&ref=feed') == 'https://careers.acme.com/job?reference=7'
@@ -0,0 +1,121 @@
+"""Re-ingesting stored jobs must not drop them from the in-memory indexes."""
+import asyncio
+import types
+from datetime import datetime
+
+import numpy as np
+from bson import ObjectId
+
+from app import ingest
+from app.nlp.ann_index import AnnIndex, build_ann_index
+from app.nlp.vector_codec import encode_embedding
+from app.nlp.vector_index import VectorIndex
+
+
+def _random_vectors(n, dim=16, seed=0):
+    vecs = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def test_ann_keeps_base_vector_for_documents_without_embedding(tmp_path):
+    vecs = _random_vectors(200)
+    ids = [ObjectId() for _ in range(200)]
+    path = str(tmp_path / 'jobs.faiss')
+    nlist = build_ann_index(ids, vecs, path, nlist=4)
+    index = AnnIndex(path, nprobe=nlist)
+    index._open()
+    assert index.search(vecs[5], 3)[0][0] == ids[5]
+
+    # a re-scraped job with unchanged content carries no embedding
+    index.add_documents([{'_id': ids[5], 'title': 'Data Scientist'}])
+    assert len(index) == 200
+    assert index.search(vecs[5], 3)[0][0] == ids[5]
+
+    # a new vector shadows the base row without changing the count
+    index.add_documents([{'_id': ids[5], 'embedding': encode_embedding(vecs[6])}])
+    assert len(index) == 200
+    assert [h[0] for h in index.search(vecs[6], 2)].count(ids[5]) == 1
+
+
+def test_vector_index_updates_attributes_without_embedding():
+    index = VectorIndex('jobs', attributes={'location': 'category'})
+    _id = ObjectId()
+    index.add_documents([{'_id': _id, 'embedding': _random_vectors(1)[0], 'location': 'Rabat'}])
+    index.add_documents([{'_id': _id, 'location': 'Casablanca'}])
+    assert len(index) == 1
+    assert index.mask({'location': lambda v: v == 'Casablanca'}).tolist() == [True]
+
+
+class _FakeJobs:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query):
+        wanted = {(field, v) for cond in query['$or'] for field, c in cond.items() for v in c['$in']}
+
+        async def cursor():
+            for doc in self.docs:
+                if any((field, doc.get(field)) in wanted for field in ('url_hash', 'fingerprint')):
+                    yield dict(doc)
+        return cursor()
+
+    async def bulk_write(self, ops, ordered):
+        for op in ops:
+            doc = next(d for d in self.docs if d['_id'] == op._filter['_id'])
+            doc.update(op._doc['$set'])
+        return types.SimpleNamespace(bulk_api_result={'nModified': len(ops), 'upserted': [], 'writeErrors': []})
+
+
+def _stored_jobs(jobs):
+    stored = []
+    for job, vec in zip(jobs, _random_vectors(len(jobs))):
+        doc = dict(job, _id=ObjectId(), embedding=encode_embedding(vec))
+        doc.update(ingest.job_keys(doc))
+        doc['content_hash'] = ingest.content_hash(doc)
+        ingest.add_skills(doc)
+        stored.append(doc)
+    return stored
+
+
+def test_only_modified_jobs_are_reindexed(monkeypatch):
+    jobs = [
+        {'title': 'Data Scientist', 'company': 'Acme', 'url': 'https://jobs.example/1', 'salary': '10k'},
+        {'title': 'Backend Developer', 'company': 'Acme', 'url': 'https://jobs.example/2', 'salary': '12k'},
+    ]
+    stored = _stored_jobs(jobs)
+    reindexed = []
+
+    async def on_jobs_inserted(docs):
+        reindexed.extend(docs)
+
+    monkeypatch.setattr(ingest, 'get_collection', lambda name: _FakeJobs(stored))
+    monkeypatch.setattr(ingest, 'on_jobs_inserted', on_jobs_inserted)
+
+    # as after select_for_embedding: same content, so no embedding; one salary changed
+    rescraped = [dict(jobs[0]), dict(jobs[1], salary='15k')]
+    result = asyncio.run(ingest.ingest_jobs(rescraped))
+
+    assert result.as_dict() == {'inserted': 0, 'updated': 1, 'skipped': 1}
+    assert [doc['_id'] for doc in reindexed] == [stored[1]['_id']]
+    assert reindexed[0]['salary'] == '15k'
+    assert reindexed[0]['embedding'] == stored[1]['embedding']
+
+
+def test_fallback_posted_date_is_not_a_change(monkeypatch):
+    job = {'title': 'Data Scientist', 'company': 'Acme', 'url': 'https://jobs.example/1',
+           'posted_date': datetime(2024, 1, 1), 'scraped_at': datetime(2024, 1, 1)}
+    stored = _stored_jobs([job])
+    reindexed = []
+
+    async def on_jobs_inserted(docs):
+        reindexed.extend(docs)
+
+    monkeypatch.setattr(ingest, 'get_collection', lambda name: _FakeJobs(stored))
+    monkeypatch.setattr(ingest, 'on_jobs_inserted', on_jobs_inserted)
+
+    # no date in the source: the scraper used the time of this scrape
+    rescraped = dict(job, posted_date=datetime(2024, 2, 1), scraped_at=datetime(2024, 2, 1))
+    result = asyncio.run(ingest.ingest_jobs([rescraped]))
+
+    assert result.as_dict() == {'inserted': 0, 'updated': 0, 'skipped': 1}
+    assert reindexed == []